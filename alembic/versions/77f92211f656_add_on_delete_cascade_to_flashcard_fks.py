@@ -0,0 +1,58 @@
+"""add on delete cascade to flashcard foreign keys
+
+Revision ID: 77f92211f656
+Revises: 3d97b7bb97e0
+Create Date: 2026-10-16 13:22:09.614027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '77f92211f656'
+down_revision: Union[str, Sequence[str], None] = '3d97b7bb97e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The original foreign keys were created unnamed; give reflected ones a
+# predictable name so batch mode can drop and recreate them
+naming_convention = {
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('flashcard', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('fk_flashcard_user_id_user', type_='foreignkey')
+        batch_op.create_foreign_key('fk_flashcard_user_id_user', 'user', ['user_id'], ['id'], ondelete='CASCADE')
+
+    with op.batch_alter_table('leitnerstate', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('fk_leitnerstate_flashcard_id_flashcard', type_='foreignkey')
+        batch_op.create_foreign_key('fk_leitnerstate_flashcard_id_flashcard', 'flashcard', ['flashcard_id'], ['id'], ondelete='CASCADE')
+
+    with op.batch_alter_table('reviewhistory', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('fk_reviewhistory_flashcard_id_flashcard', type_='foreignkey')
+        batch_op.create_foreign_key('fk_reviewhistory_flashcard_id_flashcard', 'flashcard', ['flashcard_id'], ['id'], ondelete='CASCADE')
+        batch_op.drop_constraint('fk_reviewhistory_user_id_user', type_='foreignkey')
+        batch_op.create_foreign_key('fk_reviewhistory_user_id_user', 'user', ['user_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('reviewhistory', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('fk_reviewhistory_flashcard_id_flashcard', type_='foreignkey')
+        batch_op.create_foreign_key('fk_reviewhistory_flashcard_id_flashcard', 'flashcard', ['flashcard_id'], ['id'])
+        batch_op.drop_constraint('fk_reviewhistory_user_id_user', type_='foreignkey')
+        batch_op.create_foreign_key('fk_reviewhistory_user_id_user', 'user', ['user_id'], ['id'])
+
+    with op.batch_alter_table('leitnerstate', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('fk_leitnerstate_flashcard_id_flashcard', type_='foreignkey')
+        batch_op.create_foreign_key('fk_leitnerstate_flashcard_id_flashcard', 'flashcard', ['flashcard_id'], ['id'])
+
+    with op.batch_alter_table('flashcard', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('fk_flashcard_user_id_user', type_='foreignkey')
+        batch_op.create_foreign_key('fk_flashcard_user_id_user', 'user', ['user_id'], ['id'])
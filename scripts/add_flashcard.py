@@ -6,9 +6,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from datetime import date
-from vocab_stack.database import get_session
+from typing import Optional
+from vocab_stack.database import get_session, bulk_insert_flashcards, tune_sqlite_for_bulk
 from vocab_stack.models import Flashcard, LeitnerState, Topic
-from sqlmodel import select
+from sqlmodel import Session, select
 
 
 def add_flashcard(
@@ -16,7 +17,8 @@ def add_flashcard(
     back: str,
     topic_name: str,
     example: str = None,
-    user_id: int = 1
+    user_id: int = 1,
+    session: Optional[Session] = None
 ) -> int:
     """
     Add a new flashcard programmatically.
@@ -27,6 +29,8 @@ def add_flashcard(
         topic_name: Name of topic (will be created if doesn't exist)
         example: Optional example sentence
         user_id: User ID (default: 1)
+        session: Existing session to reuse (optional). When given, the
+                 caller is responsible for committing.
         
     Returns:
         Flashcard ID
@@ -39,52 +43,57 @@ def add_flashcard(
         ...     example="Hello, how are you?"
         ... )
         >>> print(f"Created card {card_id}")
-    """
-    with get_session() as session:
-        # Get or create topic
-        topic = session.exec(
-            select(Topic).where(Topic.name == topic_name)
-        ).first()
-        
-        if not topic:
-            topic = Topic(name=topic_name, description=f"Auto-created for {topic_name}")
-            session.add(topic)
-            session.flush()
-            print(f"Created new topic: {topic_name}")
         
-        # Create flashcard
-        card = Flashcard(
-            front=front,
-            back=back,
-            example=example,
-            topic_id=topic.id,
-            user_id=user_id
-        )
-        session.add(card)
-        session.flush()
-        
-        # Create initial Leitner state
-        leitner = LeitnerState(
-            flashcard_id=card.id,
+        >>> with get_session() as session:
+        ...     add_flashcard("Cat", "Gato", "Spanish Animals", session=session)
+        ...     add_flashcard("Dog", "Perro", "Spanish Animals", session=session)
+        ...     session.commit()
+    """
+    if session is None:
+        with get_session() as session:
+            card_id = add_flashcard(front, back, topic_name, example, user_id, session=session)
+            session.commit()
+            return card_id
+    
+    # Get or create topic
+    topic = session.exec(
+        select(Topic).where(Topic.name == topic_name)
+    ).first()
+    
+    if not topic:
+        topic = Topic(name=topic_name, description=f"Auto-created for {topic_name}")
+        print(f"Created new topic: {topic_name}")
+    
+    # Create flashcard with its initial Leitner state (saved via cascade)
+    card = Flashcard(
+        front=front,
+        back=back,
+        example=example,
+        topic=topic,
+        user_id=user_id,
+        leitner_state=LeitnerState(
             box_number=1,
             next_review_date=date.today()
-        )
-        session.add(leitner)
-        session.commit()
-        
-        print(f"✅ Created flashcard: {front} → {back}")
-        return card.id
+        ),
+    )
+    session.add(card)
+    session.flush()
+    
+    print(f"✅ Created flashcard: {front} → {back}")
+    return card.id
 
 
-def add_flashcards_bulk(flashcards: list[dict]) -> list[int]:
+def add_flashcards_bulk(flashcards: list[dict], user_id: int = 1) -> list[int]:
     """
-    Add multiple flashcards at once.
+    Add multiple flashcards at once in a single transaction.
     
     Args:
         flashcards: List of dicts with keys: front, back, topic_name, example (optional)
+        user_id: User ID (default: 1)
         
     Returns:
-        List of created flashcard IDs
+        List of created flashcard IDs. Cards that already exist for the same
+        (front, topic, user) are skipped and left out of the list.
         
     Example:
         >>> cards = [
@@ -94,16 +103,50 @@ def add_flashcards_bulk(flashcards: list[dict]) -> list[int]:
         >>> ids = add_flashcards_bulk(cards)
         >>> print(f"Created {len(ids)} cards")
     """
-    card_ids = []
-    for card_data in flashcards:
-        card_id = add_flashcard(
-            front=card_data["front"],
-            back=card_data["back"],
-            topic_name=card_data["topic_name"],
-            example=card_data.get("example")
-        )
-        card_ids.append(card_id)
-    return card_ids
+    if not flashcards:
+        return []
+    
+    with get_session() as session, tune_sqlite_for_bulk(session):
+        # Resolve all topics in a single query
+        topic_names = {card_data["topic_name"] for card_data in flashcards}
+        topics_cache = {
+            topic.name: topic.id
+            for topic in session.exec(
+                select(Topic).where(Topic.name.in_(topic_names))
+            ).all()
+        }
+        
+        # Create any missing topics in one flush
+        new_topics = [
+            Topic(name=name, description=f"Auto-created for {name}")
+            for name in sorted(topic_names - topics_cache.keys())
+        ]
+        if new_topics:
+            session.add_all(new_topics)
+            session.flush()
+            for topic in new_topics:
+                topics_cache[topic.name] = topic.id
+                print(f"Created new topic: {topic.name}")
+        
+        # Create flashcards and Leitner states with batched inserts;
+        # duplicates of existing cards are skipped by the database
+        card_ids = bulk_insert_flashcards(session, [
+            {
+                "front": card_data["front"],
+                "back": card_data["back"],
+                "example": card_data.get("example"),
+                "topic_id": topics_cache[card_data["topic_name"]],
+                "user_id": user_id,
+            }
+            for card_data in flashcards
+        ], ignore_duplicates=True)
+        session.commit()
+        
+        print(f"✅ Created {len(card_ids)} flashcards")
+        if len(card_ids) < len(flashcards):
+            print(f"   Skipped {len(flashcards) - len(card_ids)} duplicate flashcards")
+        return card_ids
+
 
 
 if __name__ == "__main__":
@@ -1,21 +1,218 @@
 """Import flashcards from CSV file."""
+import argparse
+import asyncio
 import csv
 import sys
+import threading
+from itertools import islice
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from datetime import date
-from vocab_stack.database import get_session
+from vocab_stack.database import (
+    DATABASE_URL,
+    SQLITE_BULK_PRAGMAS,
+    get_session,
+    bulk_insert_flashcards,
+    tune_sqlite_for_bulk,
+)
 from vocab_stack.models import Flashcard, LeitnerState, Topic
+from sqlalchemy import Index
 from sqlmodel import select
 
+# Rows inserted and committed per transaction
+DEFAULT_CHUNK_SIZE = 1000
 
-def import_from_csv(csv_file: str, user_id: int = 1) -> int:
+# Read buffer for CSV files (1 MB)
+CSV_BUFFER_SIZE = 1 << 20
+
+# Parsed chunks the --async reader thread may buffer ahead of the writer
+ASYNC_PARSE_QUEUE_SIZE = 2
+
+# Indexes dropped during --fast imports and rebuilt afterwards
+DEFERRABLE_INDEXES = {"ix_fc_user_topic", "ix_fc_topic", "ix_leitner_due", "ix_ls_fc_due"}
+
+
+def open_csv(csv_file: str):
+    """Open a CSV file for reading with a large buffer."""
+    return open(csv_file, 'r', encoding='utf-8', buffering=CSV_BUFFER_SIZE, newline='')
+
+
+def scan_csv(csv_file: str) -> tuple[list[str], set[str]]:
+    """
+    First pass over a CSV file: read the header and collect topic names.
+    
+    Rows are streamed and discarded, so memory is bounded by the number of
+    unique topics rather than the size of the file.
+    
+    Args:
+        csv_file: Path to CSV file
+        
+    Returns:
+        (header, unique non-empty topic names)
+    """
+    with open_csv(csv_file) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if 'topic' not in header:
+            return header, set()
+        
+        topic_col = header.index('topic')
+        topic_names = {
+            row[topic_col].strip() for row in reader if len(row) > topic_col
+        }
+    
+    topic_names.discard("")
+    return header, topic_names
+
+
+def resolve_topics(session, topic_names: set[str]) -> dict[str, int]:
+    """
+    Map topic names to IDs, creating any missing topics.
+    
+    Existing topics are fetched with a single IN query and missing ones
+    are inserted with a single flush.
+    
+    Args:
+        session: Open database session
+        topic_names: Unique topic names to resolve
+        
+    Returns:
+        Dictionary of {topic_name: topic_id}
+    """
+    if not topic_names:
+        return {}
+    
+    topics_cache = {
+        topic.name: topic.id
+        for topic in session.exec(
+            select(Topic).where(Topic.name.in_(topic_names))
+        ).all()
+    }
+    
+    new_topics = [
+        Topic(name=name, description="Imported from CSV")
+        for name in sorted(topic_names - topics_cache.keys())
+    ]
+    if new_topics:
+        session.add_all(new_topics)
+        session.flush()
+        for topic in new_topics:
+            topics_cache[topic.name] = topic.id
+            print(f"   Created topic: {topic.name}")
+    
+    return topics_cache
+
+
+def validate_header(header: list[str], columns: dict[str, int]) -> bool:
+    """Check that the CSV header has the required columns."""
+    required_fields = {'front', 'back', 'topic'}
+    if not required_fields.issubset(columns):
+        print(f"❌ Error: CSV must have columns: {required_fields}")
+        print(f"   Found columns: {header}")
+        return False
+    return True
+
+
+def parse_chunk(
+    chunk: list[tuple[int, list[str]]],
+    columns: dict[str, int],
+    topics_cache: dict[str, int],
+    user_id: int
+) -> list[dict]:
+    """
+    Turn a chunk of numbered CSV rows into flashcard insert rows.
+    
+    Args:
+        chunk: (row_num, row) pairs from the CSV reader
+        columns: Header name to column index
+        topics_cache: Topic name to topic ID
+        user_id: Owner of the imported cards
+        
+    Returns:
+        Flashcard column dicts; invalid rows are reported and skipped
+    """
+    front_col = columns['front']
+    back_col = columns['back']
+    topic_col = columns['topic']
+    example_col = columns.get('example')
+    min_row_len = max(front_col, back_col, topic_col) + 1
+    
+    card_rows = []
+    for row_num, row in chunk:
+        if not row:
+            continue  # Blank line
+        
+        # Validate required fields
+        if len(row) < min_row_len:
+            print(f"⚠️  Skipping row {row_num}: Missing required field")
+            continue
+        
+        front = row[front_col].strip()
+        back = row[back_col].strip()
+        topic_name = row[topic_col].strip()
+        if example_col is not None and example_col < len(row):
+            example = row[example_col].strip() or None
+        else:
+            example = None
+        
+        if not front or not back or not topic_name:
+            print(f"⚠️  Skipping row {row_num}: Missing required field")
+            continue
+        
+        card_rows.append({
+            "front": front,
+            "back": back,
+            "example": example,
+            "topic_id": topics_cache[topic_name],
+            "user_id": user_id,
+        })
+    
+    return card_rows
+
+
+def _deferrable_indexes() -> list[Index]:
+    """Secondary indexes that are safe to rebuild after a bulk import."""
+    return [
+        index
+        for table in (Flashcard.__table__, LeitnerState.__table__)
+        for index in table.indexes
+        if index.name in DEFERRABLE_INDEXES
+    ]
+
+
+def drop_deferrable_indexes(session) -> None:
+    """Drop secondary indexes so bulk inserts skip index maintenance."""
+    connection = session.connection()
+    for index in _deferrable_indexes():
+        index.drop(connection, checkfirst=True)
+    session.commit()
+
+
+def create_deferrable_indexes(session) -> None:
+    """Recreate secondary indexes dropped by drop_deferrable_indexes."""
+    connection = session.connection()
+    for index in _deferrable_indexes():
+        index.create(connection, checkfirst=True)
+    print("   Rebuilt indexes")
+
+
+def import_from_csv(
+    csv_file: str,
+    user_id: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    fast: bool = False
+) -> int:
     """
     Import flashcards from a CSV file.
     
+    Rows are streamed and inserted in chunks of ``chunk_size``, committing
+    after each chunk so memory stays bounded and progress is durable.
+    Rows that duplicate an existing card (same front, topic and user) are
+    skipped. With ``fast``, secondary indexes are dropped for the duration
+    of the import and rebuilt once at the end.
+    
     CSV Format:
         front,back,topic,example
         Hello,Hola,Spanish Basics,Hello how are you?
@@ -24,79 +221,184 @@ def import_from_csv(csv_file: str, user_id: int = 1) -> int:
     Args:
         csv_file: Path to CSV file
         user_id: User ID (default: 1)
+        chunk_size: Rows inserted per transaction (default: 1000)
+        fast: Drop and rebuild secondary indexes around the import (default: False)
         
     Returns:
         Number of cards imported
     """
+    if chunk_size < 1:
+        print(f"❌ Error: chunk size must be a positive integer, got {chunk_size}")
+        return 0
+    
     imported_count = 0
-    topics_cache = {}  # Cache topics to avoid repeated queries
+    skipped_count = 0
     
     try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            
-            # Validate headers
-            required_fields = {'front', 'back', 'topic'}
-            if not required_fields.issubset(set(reader.fieldnames)):
-                print(f"❌ Error: CSV must have columns: {required_fields}")
-                print(f"   Found columns: {reader.fieldnames}")
-                return 0
+        # First pass: header and unique topic names only
+        header, topic_names = scan_csv(csv_file)
+        columns = {name: i for i, name in enumerate(header)}
+        if not validate_header(header, columns):
+            return 0
+        
+        # Second pass: stream rows into chunked bulk inserts
+        with open_csv(csv_file) as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Skip header
+            rows = enumerate(reader, start=2)  # Start at 2 (header is row 1)
             
-            with get_session() as session:
-                for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
-                    front = row['front'].strip()
-                    back = row['back'].strip()
-                    topic_name = row['topic'].strip()
-                    example = row.get('example', '').strip() or None
-                    
-                    # Validate required fields
-                    if not front or not back or not topic_name:
-                        print(f"⚠️  Skipping row {row_num}: Missing required field")
-                        continue
-                    
-                    # Get or create topic
-                    if topic_name not in topics_cache:
-                        topic = session.exec(
-                            select(Topic).where(Topic.name == topic_name)
-                        ).first()
+            with get_session() as session, tune_sqlite_for_bulk(session):
+                topics_cache = resolve_topics(session, topic_names)
+                
+                if fast:
+                    drop_deferrable_indexes(session)
+                
+                try:
+                    while True:
+                        chunk = list(islice(rows, chunk_size))
+                        if not chunk:
+                            break
                         
-                        if not topic:
-                            topic = Topic(name=topic_name, description=f"Imported from CSV")
-                            session.add(topic)
-                            session.flush()
-                            print(f"   Created topic: {topic_name}")
+                        card_rows = parse_chunk(chunk, columns, topics_cache, user_id)
+                        
+                        # Insert flashcards and Leitner states with executemany;
+                        # duplicates of existing cards are skipped by the database
+                        inserted = len(bulk_insert_flashcards(session, card_rows, ignore_duplicates=True))
+                        imported_count += inserted
+                        skipped_count += len(card_rows) - inserted
+                        session.commit()
+                        session.expunge_all()
                         
-                        topics_cache[topic_name] = topic.id
-                    
-                    topic_id = topics_cache[topic_name]
-                    
-                    # Create flashcard
-                    card = Flashcard(
-                        front=front,
-                        back=back,
-                        example=example,
-                        topic_id=topic_id,
-                        user_id=user_id
-                    )
-                    session.add(card)
-                    session.flush()
-                    
-                    # Create Leitner state
-                    leitner = LeitnerState(
-                        flashcard_id=card.id,
-                        box_number=1,
-                        next_review_date=date.today()
-                    )
-                    session.add(leitner)
-                    
-                    imported_count += 1
-                    
-                    if imported_count % 10 == 0:
                         print(f"   Imported {imported_count} cards...")
+                finally:
+                    if fast:
+                        # Always rebuild, even if a chunk failed part-way
+                        session.rollback()
+                        create_deferrable_indexes(session)
+                        session.commit()
+        
+        print(f"\n✅ Successfully imported {imported_count} flashcards")
+        if skipped_count:
+            print(f"   Skipped {skipped_count} duplicate flashcards")
+        return imported_count
+        
+    except FileNotFoundError:
+        print(f"❌ Error: File not found: {csv_file}")
+        return 0
+    except Exception as e:
+        print(f"❌ Error importing CSV: {e}")
+        import traceback
+        traceback.print_exc()
+        return 0
+
+
+async def import_from_csv_async(
+    csv_file: str,
+    user_id: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    """
+    Import flashcards from a CSV file using an async SQLAlchemy session.
+    
+    SQLite only allows one writer, so chunks are still inserted one at a
+    time; the gain is that the CSV is read and parsed on a worker thread,
+    at most ASYNC_PARSE_QUEUE_SIZE chunks ahead, while the previous chunk's
+    insert and commit run on the aiosqlite worker thread.
+    Requires the ``aiosqlite`` package.
+    
+    Args:
+        csv_file: Path to CSV file
+        user_id: User ID (default: 1)
+        chunk_size: Rows inserted per transaction (default: 1000)
+        
+    Returns:
+        Number of cards imported
+    """
+    if chunk_size < 1:
+        print(f"❌ Error: chunk size must be a positive integer, got {chunk_size}")
+        return 0
+    
+    try:
+        import aiosqlite  # noqa: F401
+    except ImportError:
+        print("❌ Error: async import requires aiosqlite (pip install aiosqlite)")
+        return 0
+    
+    from sqlalchemy.engine import make_url
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlmodel.ext.asyncio.session import AsyncSession
+    
+    def apply_bulk_pragmas(session) -> None:
+        # This engine is disposed after the import, so nothing is restored;
+        # it also skips the app engine's connect-time PRAGMAs
+        connection = session.connection()
+        connection.exec_driver_sql("PRAGMA synchronous=NORMAL")
+        connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+        for name, value in SQLITE_BULK_PRAGMAS.items():
+            connection.exec_driver_sql(f"PRAGMA {name}={value}")
+    
+    imported_count = 0
+    skipped_count = 0
+    
+    try:
+        # First pass: header and unique topic names only
+        header, topic_names = scan_csv(csv_file)
+        columns = {name: i for i, name in enumerate(header)}
+        if not validate_header(header, columns):
+            return 0
+        
+        engine = create_async_engine(make_url(DATABASE_URL).set(drivername="sqlite+aiosqlite"))
+        try:
+            async with AsyncSession(engine) as session:
+                await session.run_sync(apply_bulk_pragmas)
+                topics_cache = await session.run_sync(resolve_topics, topic_names)
+                await session.commit()
+                
+                # Second pass: a reader thread parses chunks into a bounded
+                # queue so parsing never blocks the event loop
+                loop = asyncio.get_running_loop()
+                queue: asyncio.Queue = asyncio.Queue(maxsize=ASYNC_PARSE_QUEUE_SIZE)
+                stop = threading.Event()
+                
+                def read_chunks() -> None:
+                    def put(item) -> None:
+                        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+                    
+                    try:
+                        with open_csv(csv_file) as f:
+                            reader = csv.reader(f)
+                            next(reader, None)  # Skip header
+                            rows = enumerate(reader, start=2)  # Start at 2 (header is row 1)
+                            while not stop.is_set():
+                                chunk = list(islice(rows, chunk_size))
+                                if not chunk:
+                                    break
+                                put(parse_chunk(chunk, columns, topics_cache, user_id))
+                    finally:
+                        put(None)  # End of input, also after an error
                 
-                session.commit()
+                reader_task = asyncio.create_task(asyncio.to_thread(read_chunks))
+                card_rows = []
+                try:
+                    while (card_rows := await queue.get()) is not None:
+                        card_ids = await session.run_sync(bulk_insert_flashcards, card_rows, True)
+                        await session.commit()
+                        imported_count += len(card_ids)
+                        skipped_count += len(card_rows) - len(card_ids)
+                        print(f"   Imported {imported_count} cards...")
+                finally:
+                    if card_rows is not None:
+                        # Stopped early: let the reader thread run to its end marker
+                        stop.set()
+                        while await queue.get() is not None:
+                            pass
+                    await reader_task  # Re-raises read or parse errors
+        finally:
+            await engine.dispose()
         
         print(f"\n✅ Successfully imported {imported_count} flashcards")
+        if skipped_count:
+            print(f"   Skipped {skipped_count} duplicate flashcards")
         return imported_count
         
     except FileNotFoundError:
@@ -109,6 +411,17 @@ def import_from_csv(csv_file: str, user_id: int = 1) -> int:
         return 0
 
 
+def positive_int(value: str) -> int:
+    """argparse type for options that must be a positive integer."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
+
+
 def create_sample_csv(filename: str = "sample_flashcards.csv"):
     """Create a sample CSV file for reference."""
     sample_data = [
@@ -128,19 +441,42 @@ def create_sample_csv(filename: str = "sample_flashcards.csv"):
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage:")
-        print("  python scripts/import_csv.py <csv_file>")
-        print("  python scripts/import_csv.py --create-sample")
-        print("\nCSV Format:")
-        print("  front,back,topic,example")
-        print("  Hello,Hola,Spanish Basics,Hello how are you?")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Import flashcards from a CSV file.",
+        epilog="CSV Format:\n  front,back,topic,example\n  Hello,Hola,Spanish Basics,Hello how are you?",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("csv_file", nargs="?", help="Path to CSV file")
+    parser.add_argument("--create-sample", action="store_true", help="Create a sample CSV file")
+    parser.add_argument(
+        "--chunk-size",
+        type=positive_int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Rows inserted per transaction (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Drop secondary indexes during the import and rebuild them afterwards "
+             "(locks the tables; best for large one-off imports)",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Use the async import path (requires aiosqlite)",
+    )
+    args = parser.parse_args()
     
-    if sys.argv[1] == "--create-sample":
+    if args.create_sample:
         create_sample_csv()
+    elif not args.csv_file:
+        parser.print_help()
+        sys.exit(1)
     else:
-        csv_file = sys.argv[1]
-        count = import_from_csv(csv_file)
+        if args.use_async:
+            count = asyncio.run(import_from_csv_async(args.csv_file, chunk_size=args.chunk_size))
+        else:
+            count = import_from_csv(args.csv_file, chunk_size=args.chunk_size, fast=args.fast)
         if count > 0:
             print(f"\n🎉 Import complete! {count} cards added to your deck.")
@@ -2,9 +2,10 @@
 import sys
 sys.path.insert(0, '.')
 
-from vocab_stack.database import get_session, create_db_and_tables
+from vocab_stack.database import get_session, create_db_and_tables, tune_sqlite_for_bulk
 from vocab_stack.models import User, Topic, Flashcard, LeitnerState
 from datetime import date
+from sqlalchemy import exists
 from sqlmodel import select
 
 
@@ -14,10 +15,9 @@ def seed_database():
     # Ensure tables exist
     create_db_and_tables()
     
-    with get_session() as session:
+    with get_session() as session, tune_sqlite_for_bulk(session):
         # Check if data already exists
-        existing_user = session.exec(select(User)).first()
-        if existing_user:
+        if session.scalar(select(exists().select_from(User))):
             print("⚠️  Database already seeded!")
             return
         
@@ -26,8 +26,6 @@ def seed_database():
             username="demo_user",
             email="demo@example.com"
         )
-        session.add(user)
-        session.flush()  # Get user.id before commit
         
         # Create sample topics
         topics = [
@@ -35,37 +33,32 @@ def seed_database():
             Topic(name="Business English", description="Professional terminology"),
             Topic(name="Travel Phrases", description="Useful phrases for travelers"),
         ]
-        session.add_all(topics)
-        session.flush()
         
-        # Create sample flashcards
+        today = date.today()
+        
+        # Create sample flashcards with their Leitner states; IDs are
+        # assigned by the single flush at commit via relationship cascades
         flashcards = [
             Flashcard(
                 front="Hello",
                 back="A greeting",
                 example="Hello, how are you?",
-                topic_id=topics[0].id,
-                user_id=user.id
+                topic=topics[0],
+                user=user,
+                leitner_state=LeitnerState(box_number=1, next_review_date=today),
             ),
             Flashcard(
                 front="Meeting",
                 back="A gathering of people for discussion",
                 example="We have a meeting at 2 PM.",
-                topic_id=topics[1].id,
-                user_id=user.id
+                topic=topics[1],
+                user=user,
+                leitner_state=LeitnerState(box_number=1, next_review_date=today),
             ),
         ]
+        session.add(user)
+        session.add_all(topics)
         session.add_all(flashcards)
-        session.flush()
-        
-        # Create Leitner states for flashcards
-        for card in flashcards:
-            leitner = LeitnerState(
-                flashcard_id=card.id,
-                box_number=1,
-                next_review_date=date.today()
-            )
-            session.add(leitner)
         
         session.commit()
         print("✅ Database seeded successfully!")
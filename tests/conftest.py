@@ -0,0 +1,35 @@
+"""Pytest configuration: run the suite against a throwaway database."""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# Must be set before vocab_stack (and rxconfig) is imported. A temporary file
+# (not :memory:) so vocab_stack.database.engine and rx.session() share one
+# database; rx.session()'s engine passes pool options SQLite's memory pool
+# rejects.
+TEST_DB_DIR = tempfile.mkdtemp(prefix="vocab_stack_test_")
+TEST_DB_URL = f"sqlite:///{os.path.join(TEST_DB_DIR, 'test.db')}"
+os.environ.setdefault("REFLEX_DB_URL", TEST_DB_URL)
+os.environ.setdefault("DB_URL", TEST_DB_URL)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the schema once for the whole test session."""
+    from vocab_stack.database import create_db_and_tables
+    
+    create_db_and_tables()
+    yield
+    shutil.rmtree(TEST_DB_DIR, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    """Discard cached results after each test."""
+    yield
+    from vocab_stack.services.leitner_service import LeitnerService
+    
+    # Test data is recreated between tests and SQLite may reuse the IDs
+    LeitnerService.invalidate_user_progress()
@@ -8,7 +8,7 @@ from vocab_stack.models import User, Topic, Flashcard, LeitnerState, ReviewHisto
 from vocab_stack.services.leitner_service import LeitnerService
 from vocab_stack.services.statistics_service import StatisticsService
 from vocab_stack.services.settings_service import SettingsService
-from sqlmodel import select
+from sqlmodel import select, func
 
 
 def test_complete_learning_workflow():
@@ -19,88 +19,78 @@ def test_complete_learning_workflow():
     
     create_db_and_tables()
     
-    # Step 1: Create user
-    print("\n1️⃣  Creating user...")
-    with get_session() as session:
+    # Steps 1-3 share one transaction, committed when the block exits
+    with get_session() as session, session.begin():
+        # Step 1: Create user
+        print("\n1️⃣  Creating user...")
         # Check if user exists first
-        existing = session.exec(
-            select(User).where(User.username == "test_workflow")
-        ).first()
+        existing_id = session.scalar(
+            select(User.id).where(User.username == "test_workflow")
+        )
         
-        if existing:
-            user_id = existing.id
+        if existing_id:
+            user_id = existing_id
             print(f"   Using existing user: {user_id}")
         else:
-            user = User(username="test_workflow", email="workflow@test.com")
+            user = User(username="test_workflow", email="workflow@test.com", password_hash="not-a-real-hash")
             session.add(user)
-            session.commit()
-            session.refresh(user)
+            session.flush()
             user_id = user.id
             print(f"   User created: {user_id}")
-    print("✅ User ready")
-    
-    # Step 2: Create topic
-    print("\n2️⃣  Creating topic...")
-    with get_session() as session:
+        print("✅ User ready")
+        
+        # Step 2: Create topic
+        print("\n2️⃣  Creating topic...")
         # Check if topic exists
-        existing = session.exec(
-            select(Topic).where(Topic.name == "Test Workflow Topic")
-        ).first()
+        existing_id = session.scalar(
+            select(Topic.id).where(Topic.name == "Test Workflow Topic")
+        )
         
-        if existing:
-            topic_id = existing.id
+        if existing_id:
+            topic_id = existing_id
             print(f"   Using existing topic: {topic_id}")
         else:
             topic = Topic(name="Test Workflow Topic", description="For testing")
             session.add(topic)
-            session.commit()
-            session.refresh(topic)
+            session.flush()
             topic_id = topic.id
             print(f"   Topic created: {topic_id}")
-    print("✅ Topic ready")
-    
-    # Step 3: Create flashcards
-    print("\n3️⃣  Creating flashcards...")
-    with get_session() as session:
+        print("✅ Topic ready")
+        
+        # Step 3: Create flashcards
+        print("\n3️⃣  Creating flashcards...")
         # Check existing cards for this topic/user
-        existing_count = session.exec(
-            select(Flashcard).where(
+        existing_count = session.scalar(
+            select(func.count()).select_from(Flashcard).where(
                 Flashcard.topic_id == topic_id,
                 Flashcard.user_id == user_id
             )
-        ).all()
+        )
         
-        if len(existing_count) >= 10:
-            print(f"   Using existing {len(existing_count)} flashcards")
+        if existing_count >= 10:
+            print(f"   Using existing {existing_count} flashcards")
         else:
-            cards_to_create = 10 - len(existing_count)
-            for i in range(cards_to_create):
-                card = Flashcard(
-                    front=f"Question {len(existing_count) + i + 1}",
-                    back=f"Answer {len(existing_count) + i + 1}",
-                    example=f"Example {len(existing_count) + i + 1}",
+            cards_to_create = 10 - existing_count
+            today = date.today()
+            # New cards get their Leitner state via the relationship cascade,
+            # so all rows are inserted by the single flush on commit
+            session.add_all([
+                Flashcard(
+                    front=f"Question {existing_count + i + 1}",
+                    back=f"Answer {existing_count + i + 1}",
+                    example=f"Example {existing_count + i + 1}",
                     topic_id=topic_id,
-                    user_id=user_id
-                )
-                session.add(card)
-                session.flush()
-                
-                # Check if leitner state exists
-                existing_leitner = session.exec(
-                    select(LeitnerState).where(LeitnerState.flashcard_id == card.id)
-                ).first()
-                
-                if not existing_leitner:
-                    leitner = LeitnerState(
-                        flashcard_id=card.id,
+                    user_id=user_id,
+                    leitner_state=LeitnerState(
                         box_number=1,
-                        next_review_date=date.today()
-                    )
-                    session.add(leitner)
+                        next_review_date=today
+                    ),
+                )
+                for i in range(cards_to_create)
+            ])
             
-            session.commit()
             print(f"   Created {cards_to_create} new flashcards")
-    print("✅ Flashcards ready")
+        print("✅ Flashcards ready")
     
     # Step 4: Simulate review session
     print("\n4️⃣  Simulating review session...")
@@ -108,24 +98,19 @@ def test_complete_learning_workflow():
     print(f"   Found {len(due_cards)} cards due")
     
     if len(due_cards) > 0:
-        correct = 0
-        incorrect = 0
-        for i, card in enumerate(due_cards[:5]):
-            was_correct = i % 2 == 0  # Alternate correct/incorrect
-            result = LeitnerService.process_review(
-                flashcard_id=card.id,
-                user_id=user_id,
-                was_correct=was_correct,
-                time_spent_seconds=10
-            )
-            
-            if was_correct:
-                correct += 1
-            else:
-                incorrect += 1
-            
+        # Alternate correct/incorrect, submitted as one batch
+        reviews = [
+            (card.id, i % 2 == 0, 10)
+            for i, card in enumerate(due_cards[:5])
+        ]
+        results = LeitnerService.process_reviews(reviews, user_id=user_id)
+        assert len(results) == len(reviews)
+        
+        for i, result in enumerate(results):
             print(f"   Card {i+1}: Box {result['old_box']} → {result['new_box']}")
         
+        correct = sum(1 for _, was_correct, _ in reviews if was_correct)
+        incorrect = len(reviews) - correct
         print(f"✅ Review session complete: {correct} correct, {incorrect} incorrect")
     else:
         print("⚠️  No cards due for review (cards may have been reviewed recently)")
@@ -137,6 +122,14 @@ def test_complete_learning_workflow():
     print(f"   Total reviews: {stats['total_reviews']}")
     print(f"   Accuracy: {stats['overall_accuracy']}%")
     print(f"   Box distribution: {stats['box_distribution']}")
+    
+    # Batched overview agrees with the per-user one
+    batch = StatisticsService.get_overview_for_users([user_id])[user_id]
+    assert batch["total_reviews"] == stats["total_reviews"]
+    assert batch["reviews_today"] == stats["reviews_today"]
+    assert batch["current_streak"] == StatisticsService.get_learning_streak(user_id)["current_streak"]
+    if stats["total_reviews"]:
+        assert StatisticsService.get_overview_for_users(None)[user_id] == batch
     print("✅ Statistics calculated")
     
     # Step 6: Update settings
@@ -156,6 +149,9 @@ def test_complete_learning_workflow():
     assert loaded_settings["cards_per_session"] == 15, "cards_per_session mismatch"
     assert loaded_settings["daily_goal"] == 75, "daily_goal mismatch"
     assert loaded_settings["show_examples"] == False, "show_examples mismatch"
+    snapshot = StatisticsService.get_daily_goal_snapshot(user_id)
+    assert snapshot["daily_goal"] == 75, "daily goal snapshot mismatch"
+    assert snapshot["reviews_today"] == StatisticsService.get_user_overview(user_id)["reviews_today"]
     print("✅ Settings verified")
     
     # Step 8: Check topic progress
@@ -209,6 +205,7 @@ def test_edge_cases():
     print("\n5️⃣  Testing settings for non-existent user...")
     settings = SettingsService.get_user_settings(999)
     assert settings == {}
+    assert StatisticsService.get_daily_goal_snapshot(999) == {}
     print("✅ Handles missing user gracefully")
     
     print("\n" + "=" * 70)
@@ -6,6 +6,8 @@ sys.path.insert(0, '.')
 from vocab_stack.database import get_session, create_db_and_tables, drop_all_tables
 from vocab_stack.models import User, Topic, Flashcard, LeitnerState, ReviewHistory
 from datetime import datetime, date
+from sqlalchemy import delete
+from sqlalchemy.orm import selectinload
 from sqlmodel import select
 
 
@@ -13,11 +15,10 @@ def test_create_user():
     """Test creating a user."""
     print("\n🧪 Testing User Creation...")
     
-    with get_session() as session:
-        user = User(username="test_user", email="test@test.com")
+    with get_session() as session, session.begin():
+        user = User(username="test_user", email="test@test.com", password_hash="not-a-real-hash")
         session.add(user)
-        session.commit()
-        session.refresh(user)  # Reload from DB to get ID
+        session.flush()  # Assign ID; committed when the block exits
         
         print(f"✅ Created user: {user.username} (ID: {user.id})")
         return user.id
@@ -40,34 +41,26 @@ def test_create_topic_and_flashcard():
     """Test creating topic with flashcards."""
     print("\n🧪 Testing Topic and Flashcard Creation...")
     
-    with get_session() as session:
+    with get_session() as session, session.begin():
         # Get or create user
         user = session.exec(select(User).where(User.username == "test_user")).first()
         
         # Create topic
         topic = Topic(name="Test Topic", description="For testing")
-        session.add(topic)
-        session.flush()
         
-        # Create flashcard
+        # Create flashcard with its Leitner state; inserted in one flush on commit
         card = Flashcard(
             front="Test Front",
             back="Test Back",
-            topic_id=topic.id,
-            user_id=user.id
+            topic=topic,
+            user=user,
+            leitner_state=LeitnerState(
+                box_number=1,
+                next_review_date=date.today()
+            ),
         )
         session.add(card)
-        session.flush()
-        
-        # Create Leitner state
-        leitner = LeitnerState(
-            flashcard_id=card.id,
-            box_number=1,
-            next_review_date=date.today()
-        )
-        session.add(leitner)
         
-        session.commit()
         print(f"✅ Created topic '{topic.name}' with flashcard")
 
 
@@ -76,9 +69,11 @@ def test_relationships():
     print("\n🧪 Testing Relationships...")
     
     with get_session() as session:
-        # Get topic with flashcards
+        # Get topic with flashcards and their Leitner states (no lazy loads)
         topic = session.exec(
-            select(Topic).where(Topic.name == "Test Topic")
+            select(Topic)
+            .where(Topic.name == "Test Topic")
+            .options(selectinload(Topic.flashcards).selectinload(Flashcard.leitner_state))
         ).first()
         
         print(f"✅ Topic '{topic.name}' has {len(topic.flashcards)} flashcards:")
@@ -92,14 +87,13 @@ def test_update_flashcard():
     """Test updating a flashcard."""
     print("\n🧪 Testing Flashcard Update...")
     
-    with get_session() as session:
+    with get_session() as session, session.begin():
         card = session.exec(
             select(Flashcard).where(Flashcard.front == "Test Front")
         ).first()
         
         card.back = "Updated Back"
         session.add(card)
-        session.commit()
         
         print(f"✅ Updated flashcard: {card.front} → {card.back}")
 
@@ -108,24 +102,21 @@ def test_delete_flashcard():
     """Test deleting a flashcard."""
     print("\n🧪 Testing Flashcard Deletion...")
     
-    with get_session() as session:
+    with get_session() as session, session.begin():
         card = session.exec(
             select(Flashcard).where(Flashcard.front == "Test Front")
         ).first()
         
         if card:
-            # Delete associated LeitnerState first (due to foreign key)
-            if card.leitner_state:
-                session.delete(card.leitner_state)
+            card_id, front = card.id, card.front
             
-            # Delete any review history
-            for review in card.review_history:
-                session.delete(review)
+            # Delete child rows first (due to foreign keys), one statement per table
+            session.execute(delete(ReviewHistory).where(ReviewHistory.flashcard_id == card_id))
+            session.execute(delete(LeitnerState).where(LeitnerState.flashcard_id == card_id))
             
             # Now delete the card
-            session.delete(card)
-            session.commit()
-            print(f"✅ Deleted flashcard: {card.front}")
+            session.execute(delete(Flashcard).where(Flashcard.id == card_id))
+            print(f"✅ Deleted flashcard: {front}")
 
 
 def run_all_tests():
@@ -1,10 +1,15 @@
 """Comprehensive tests for Leitner algorithm."""
+import os
 import sys
 sys.path.insert(0, '.')
 
+import pytest
 from datetime import date, timedelta
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import SQLModel
 from vocab_stack.database import get_session, create_db_and_tables, drop_all_tables
-from vocab_stack.models import User, Topic, Flashcard, LeitnerState
+from vocab_stack.models import DailyReviewCount, User, Topic, Flashcard, LeitnerState
+from vocab_stack.services import leitner_service
 from vocab_stack.services.leitner_service import LeitnerService
 from vocab_stack.utils.date_helpers import (
     calculate_next_review_date,
@@ -13,51 +18,71 @@ from vocab_stack.utils.date_helpers import (
 )
 
 
+# Progress output is only written when TEST_VERBOSE=1 (or run as a script)
+VERBOSE = os.getenv("TEST_VERBOSE") == "1"
+
+
+def log(*args, **kwargs):
+    """Print progress output in verbose mode only."""
+    if VERBOSE:
+        print(*args, **kwargs)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def schema():
+    """Rebuild the schema once for this module."""
+    drop_all_tables()
+    create_db_and_tables()
+    yield
+
+
+@pytest.fixture
+def leitner_data():
+    """Fresh user, topic and cards for each test."""
+    return setup_test_data()
+
+
+def clear_tables():
+    """Delete all rows (keeping the schema) so each test starts clean."""
+    with get_session() as session:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            session.execute(table.delete())
+        session.commit()
+
+
 def setup_test_data():
     """Create test data for Leitner tests."""
     # Clean slate
-    drop_all_tables()
-    create_db_and_tables()
+    clear_tables()
     
     with get_session() as session:
-        # Create user
-        user = User(username="test_leitner", email="leitner@test.com")
-        session.add(user)
-        session.flush()
-        
-        # Create topic
+        user = User(username="test_leitner", email="leitner@test.com", password_hash="not-a-real-hash")
         topic = Topic(name="Leitner Test Topic")
-        session.add(topic)
-        session.flush()
         
-        # Create flashcards
-        cards = []
-        for i in range(5):
-            card = Flashcard(
+        # Create flashcards with their Leitner states (all start in Box 1);
+        # the cascade inserts every row in one flush with executemany batches
+        today = date.today()
+        cards = [
+            Flashcard(
                 front=f"Test Card {i+1}",
                 back=f"Answer {i+1}",
-                topic_id=topic.id,
-                user_id=user.id
-            )
-            session.add(card)
-            session.flush()
-            
-            # Create Leitner state (all start in Box 1)
-            leitner = LeitnerState(
-                flashcard_id=card.id,
-                box_number=1,
-                next_review_date=date.today()
+                topic=topic,
+                user=user,
+                leitner_state=LeitnerState(
+                    box_number=1,
+                    next_review_date=today
+                ),
             )
-            session.add(leitner)
-            cards.append(card)
-        
+            for i in range(5)
+        ]
+        session.add_all(cards)
         session.commit()
         return user.id, topic.id, [c.id for c in cards]
 
 
 def test_date_calculations():
     """Test date helper functions."""
-    print("\n🧪 Testing Date Calculations...")
+    log("\n🧪 Testing Date Calculations...")
     
     # Test review intervals
     assert get_review_interval(1) == 1, "Box 1 should be 1 day"
@@ -77,30 +102,31 @@ def test_date_calculations():
     assert is_due_for_review(date.today() - timedelta(days=1)) == True
     assert is_due_for_review(date.today() + timedelta(days=1)) == False
     
-    print("✅ Date calculations working correctly")
+    log("✅ Date calculations working correctly")
 
 
-def test_card_progression_correct():
+def test_card_progression_correct(leitner_data):
     """Test card moves from Box 1→2→3→4→5 on correct answers."""
-    print("\n🧪 Testing Card Progression (Correct Answers)...")
+    log("\n🧪 Testing Card Progression (Correct Answers)...")
     
-    user_id, topic_id, card_ids = setup_test_data()
+    user_id, topic_id, card_ids = leitner_data
     card_id = card_ids[0]
     
     # Test progression through all boxes
     expected_boxes = [2, 3, 4, 5, 5]  # Box 5 stays at 5
     
-    for i, expected_box in enumerate(expected_boxes):
-        result = LeitnerService.process_review(
-            flashcard_id=card_id,
-            user_id=user_id,
-            was_correct=True
-        )
-        
+    # Submit all reviews as one batch; results come back per review
+    results = LeitnerService.process_reviews(
+        [(card_id, True, None)] * len(expected_boxes),
+        user_id=user_id
+    )
+    assert len(results) == len(expected_boxes)
+    
+    for i, (result, expected_box) in enumerate(zip(results, expected_boxes)):
         assert result["new_box"] == expected_box, \
             f"After review {i+1}, expected box {expected_box}, got {result['new_box']}"
         
-        print(f"   Review {i+1}: Box {result['old_box']} → Box {result['new_box']} ✓")
+        log(f"   Review {i+1}: Box {result['old_box']} → Box {result['new_box']} ✓")
     
     # Verify final state
     stats = LeitnerService.get_card_statistics(card_id)
@@ -108,19 +134,18 @@ def test_card_progression_correct():
     assert stats["correct_count"] == 5, "Should have 5 correct reviews"
     assert stats["incorrect_count"] == 0, "Should have 0 incorrect reviews"
     
-    print("✅ Card progression working correctly")
+    log("✅ Card progression working correctly")
 
 
-def test_card_regression_incorrect():
+def test_card_regression_incorrect(leitner_data):
     """Test card moves back to Box 1 on incorrect answer."""
-    print("\n🧪 Testing Card Regression (Incorrect Answer)...")
+    log("\n🧪 Testing Card Regression (Incorrect Answer)...")
     
-    user_id, topic_id, card_ids = setup_test_data()
+    user_id, topic_id, card_ids = leitner_data
     card_id = card_ids[1]
     
     # Move card to Box 3
-    for _ in range(2):
-        LeitnerService.process_review(card_id, user_id, was_correct=True)
+    LeitnerService.process_reviews([(card_id, True, None)] * 2, user_id)
     
     stats = LeitnerService.get_card_statistics(card_id)
     assert stats["box_number"] == 3, "Card should be in Box 3"
@@ -140,19 +165,36 @@ def test_card_regression_incorrect():
     assert stats["box_number"] == 1, "Card should be in Box 1"
     assert stats["incorrect_count"] == 1, "Should have 1 incorrect review"
     
-    print("✅ Card regression working correctly")
+    log("✅ Card regression working correctly")
+
+
+def test_batch_skips_missing_cards(leitner_data):
+    """Test a batch still applies when one queued card no longer exists."""
+    log("\n🧪 Testing Batch With Missing Card...")
+    
+    user_id, topic_id, card_ids = leitner_data
+    card_id = card_ids[0]
+    
+    results = LeitnerService.process_reviews(
+        [(card_id, True, None), (10**9, True, None)],
+        user_id=user_id
+    )
+    
+    assert len(results) == 1, "Missing card should get no result"
+    assert LeitnerService.get_card_statistics(card_id)["box_number"] == 2
+    
+    log("✅ Missing cards skipped in batch")
 
 
-def test_box5_stays_on_correct():
+def test_box5_stays_on_correct(leitner_data):
     """Test that Box 5 stays in Box 5 on correct answer."""
-    print("\n🧪 Testing Box 5 Stays on Correct...")
+    log("\n🧪 Testing Box 5 Stays on Correct...")
     
-    user_id, topic_id, card_ids = setup_test_data()
+    user_id, topic_id, card_ids = leitner_data
     card_id = card_ids[2]
     
     # Move card to Box 5
-    for _ in range(4):
-        LeitnerService.process_review(card_id, user_id, was_correct=True)
+    LeitnerService.process_reviews([(card_id, True, None)] * 4, user_id)
     
     stats = LeitnerService.get_card_statistics(card_id)
     assert stats["box_number"] == 5, "Card should be in Box 5"
@@ -165,14 +207,14 @@ def test_box5_stays_on_correct():
     stats = LeitnerService.get_card_statistics(card_id)
     assert stats["box_number"] == 5, "Card should still be in Box 5"
     
-    print("✅ Box 5 stays on correct working correctly")
+    log("✅ Box 5 stays on correct working correctly")
 
 
-def test_next_review_dates():
+def test_next_review_dates(leitner_data):
     """Test next review dates calculated correctly for each box."""
-    print("\n🧪 Testing Next Review Date Calculation...")
+    log("\n🧪 Testing Next Review Date Calculation...")
     
-    user_id, topic_id, card_ids = setup_test_data()
+    user_id, topic_id, card_ids = leitner_data
     card_id = card_ids[3]
     
     # After correct answer, card moves to next box
@@ -183,9 +225,13 @@ def test_next_review_dates():
     # Box 5 → Box 5 (next review in 30 days)
     expected_intervals = [3, 7, 14, 30, 30]  # Days for boxes 2-5
     
-    for i, expected_days in enumerate(expected_intervals, start=1):
-        result = LeitnerService.process_review(card_id, user_id, was_correct=True)
-        
+    results = LeitnerService.process_reviews(
+        [(card_id, True, None)] * len(expected_intervals),
+        user_id
+    )
+    assert len(results) == len(expected_intervals)
+    
+    for result, expected_days in zip(results, expected_intervals):
         # Calculate expected next review date based on NEW box
         expected_date = date.today() + timedelta(days=expected_days)
         actual_date = result["next_review_date"]
@@ -193,16 +239,16 @@ def test_next_review_dates():
         assert actual_date == expected_date, \
             f"Box {result['new_box']}: Expected next review {expected_date}, got {actual_date}"
         
-        print(f"   Box {result['new_box']}: Next review in {expected_days} days ✓")
+        log(f"   Box {result['new_box']}: Next review in {expected_days} days ✓")
     
-    print("✅ Next review dates calculated correctly")
+    log("✅ Next review dates calculated correctly")
 
 
-def test_get_due_cards():
+def test_get_due_cards(leitner_data):
     """Test getting cards due for review today."""
-    print("\n🧪 Testing Get Due Cards...")
+    log("\n🧪 Testing Get Due Cards...")
     
-    user_id, topic_id, card_ids = setup_test_data()
+    user_id, topic_id, card_ids = leitner_data
     
     # All cards should be due (all in Box 1 with today's date)
     due_cards = LeitnerService.get_due_cards(topic_id=topic_id, user_id=user_id)
@@ -215,14 +261,21 @@ def test_get_due_cards():
     due_cards = LeitnerService.get_due_cards(topic_id=topic_id, user_id=user_id)
     assert len(due_cards) == 4, f"Expected 4 due cards, got {len(due_cards)}"
     
-    print("✅ Get due cards working correctly")
+    # Column-only variant returns the same cards, limit applied
+    rows = LeitnerService.get_due_card_rows(topic_id=topic_id, user_id=user_id)
+    assert sorted(row["id"] for row in rows) == sorted(card.id for card in due_cards)
+    sample = LeitnerService.get_due_card_rows(topic_id=topic_id, limit=2)
+    assert len(sample) == 2 and {row["id"] for row in sample} <= {card.id for card in due_cards}
+    assert sorted(leitner_service._reservoir_sample(iter(range(10)), 20)) == list(range(10))
+    
+    log("✅ Get due cards working correctly")
 
 
-def test_topic_progress():
+def test_topic_progress(leitner_data):
     """Test topic progress statistics."""
-    print("\n🧪 Testing Topic Progress...")
+    log("\n🧪 Testing Topic Progress...")
     
-    user_id, topic_id, card_ids = setup_test_data()
+    user_id, topic_id, card_ids = leitner_data
     
     # Initial state: all cards in Box 1
     progress = LeitnerService.get_topic_progress(topic_id, user_id)
@@ -231,28 +284,39 @@ def test_topic_progress():
     assert progress["mastered"] == 0, "None mastered"
     
     # Move 2 cards to Box 5 (mastered)
-    for _ in range(4):
-        LeitnerService.process_review(card_ids[0], user_id, was_correct=True)
-        LeitnerService.process_review(card_ids[1], user_id, was_correct=True)
+    LeitnerService.process_reviews(
+        [(card_ids[0], True, None), (card_ids[1], True, None)] * 4,
+        user_id
+    )
     
     progress = LeitnerService.get_topic_progress(topic_id, user_id)
     assert progress["mastered"] == 2, "Should have 2 mastered cards"
     assert progress["mastered_percentage"] == 40.0, "Should be 40% mastered"
     
-    print("✅ Topic progress tracking working correctly")
+    # Dashboard query carries the topic columns alongside the same counts
+    (joined,) = LeitnerService.get_user_topic_progress(user_id)
+    assert joined["id"] == topic_id
+    assert {k: joined[k] for k in progress} == progress
+    
+    log("✅ Topic progress tracking working correctly")
 
 
-def test_review_history():
+def test_review_history(leitner_data):
     """Test review history is recorded."""
-    print("\n🧪 Testing Review History...")
+    log("\n🧪 Testing Review History...")
     
-    user_id, topic_id, card_ids = setup_test_data()
+    user_id, topic_id, card_ids = leitner_data
     card_id = card_ids[4]
     
     # Perform several reviews
-    LeitnerService.process_review(card_id, user_id, was_correct=True, time_spent_seconds=10)
-    LeitnerService.process_review(card_id, user_id, was_correct=False, time_spent_seconds=15)
-    LeitnerService.process_review(card_id, user_id, was_correct=True, time_spent_seconds=8)
+    LeitnerService.process_reviews(
+        [
+            (card_id, True, 10),
+            (card_id, False, 15),
+            (card_id, True, 8),
+        ],
+        user_id
+    )
     
     # Check statistics
     stats = LeitnerService.get_card_statistics(card_id)
@@ -261,28 +325,98 @@ def test_review_history():
     assert stats["incorrect_count"] == 1, "Should have 1 incorrect"
     assert stats["accuracy"] == 66.67, "Should be 66.67% accurate"
     
-    print("✅ Review history recorded correctly")
+    log("✅ Review history recorded correctly")
+
+
+def test_batch_loaders(leitner_data):
+    """Test batched state lookups."""
+    log("\n🧪 Testing Batch Loaders...")
+    
+    user_id, topic_id, card_ids = leitner_data
+    
+    LeitnerService.process_reviews(
+        [(card_ids[0], True, None), (card_ids[0], False, None), (card_ids[1], True, None)],
+        user_id
+    )
+    
+    states = LeitnerService.get_states_for(card_ids)
+    assert set(states) == set(card_ids), "Should return a state per card"
+    assert states[card_ids[0]] == LeitnerService.get_card_statistics(card_ids[0])
+    assert states[card_ids[1]]["box_number"] == 2, "Card 2 should be in Box 2"
+    
+    # Same results when the IDs are split across several IN queries
+    original_chunk_size = leitner_service.IN_CLAUSE_CHUNK_SIZE
+    leitner_service.IN_CLAUSE_CHUNK_SIZE = 1
+    try:
+        assert LeitnerService.get_states_for(card_ids) == states
+    finally:
+        leitner_service.IN_CLAUSE_CHUNK_SIZE = original_chunk_size
+    
+    log("✅ Batch loaders working correctly")
+
+
+def test_daily_count_upsert_dialects():
+    """Test the daily counter upsert compiles for SQLite and PostgreSQL."""
+    log("\n🧪 Testing Daily Count Upsert Dialects...")
+    
+    for dialect in (sqlite.dialect(), postgresql.dialect()):
+        stmt = leitner_service._count_reviews_stmt(dialect.name, 1, date.today(), 1)
+        sql = str(stmt.compile(dialect=dialect))
+        assert "ON CONFLICT" in sql, f"{dialect.name} should upsert"
+    
+    assert leitner_service._count_reviews_stmt("mssql", 1, date.today(), 1) is None
+    
+    log("✅ Daily count upsert compiles for both dialects")
+
+
+def test_daily_count_fallback(leitner_data):
+    """Test the UPDATE-then-INSERT counter used without ON CONFLICT."""
+    log("\n🧪 Testing Daily Count Fallback...")
+    
+    user_id, topic_id, card_ids = leitner_data
+    
+    original_inserts = leitner_service._ON_CONFLICT_INSERTS
+    leitner_service._ON_CONFLICT_INSERTS = {}
+    try:
+        LeitnerService.process_reviews([(card_ids[0], True, None)] * 2, user_id)
+        LeitnerService.process_review(card_ids[1], user_id, was_correct=True)
+    finally:
+        leitner_service._ON_CONFLICT_INSERTS = original_inserts
+    
+    with get_session() as session:
+        count = session.get(DailyReviewCount, (user_id, date.today())).count
+    assert count == 3, "Both paths should add to the same row"
+    
+    log("✅ Daily count fallback working correctly")
 
 
 def run_all_leitner_tests():
     """Run all Leitner algorithm tests."""
-    print("=" * 70)
-    print("🚀 Running Leitner Algorithm Tests")
-    print("=" * 70)
+    log("=" * 70)
+    log("🚀 Running Leitner Algorithm Tests")
+    log("=" * 70)
     
-    test_date_calculations()
-    test_card_progression_correct()
-    test_card_regression_incorrect()
-    test_box5_stays_on_correct()
-    test_next_review_dates()
-    test_get_due_cards()
-    test_topic_progress()
-    test_review_history()
+    drop_all_tables()
+    create_db_and_tables()
     
-    print("\n" + "=" * 70)
-    print("✅ All Leitner Algorithm Tests Passed!")
-    print("=" * 70)
+    test_date_calculations()
+    test_card_progression_correct(setup_test_data())
+    test_card_regression_incorrect(setup_test_data())
+    test_batch_skips_missing_cards(setup_test_data())
+    test_box5_stays_on_correct(setup_test_data())
+    test_next_review_dates(setup_test_data())
+    test_get_due_cards(setup_test_data())
+    test_topic_progress(setup_test_data())
+    test_review_history(setup_test_data())
+    test_batch_loaders(setup_test_data())
+    test_daily_count_upsert_dialects()
+    test_daily_count_fallback(setup_test_data())
+    
+    log("\n" + "=" * 70)
+    log("✅ All Leitner Algorithm Tests Passed!")
+    log("=" * 70)
 
 
 if __name__ == "__main__":
+    VERBOSE = True
     run_all_leitner_tests()
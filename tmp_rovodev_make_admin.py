@@ -6,27 +6,35 @@ sys.path.insert(0, '.')
 
 from vocab_stack.database import get_session
 from vocab_stack.models import User
+from sqlalchemy import update
 from sqlmodel import select
 
 print("Making mknaepen an admin...\n")
 
 with get_session() as session:
-    # Find the user
-    user = session.exec(select(User).where(User.username == "mknaepen")).first()
+    # Flip the flag in one statement; no row back means the user is
+    # missing or already an admin
+    user = session.execute(
+        update(User)
+        .where(User.username == "mknaepen", User.is_admin == False)
+        .values(is_admin=True)
+        .returning(User.id, User.username, User.email, User.is_admin)
+    ).first()
     
-    if not user:
-        print("❌ User 'mknaepen' not found!")
-        sys.exit(1)
-    
-    # Check if already admin
-    if user.is_admin:
-        print(f"✓ User '{user.username}' is already an admin")
-    else:
-        # Make admin
-        user.is_admin = True
-        session.add(user)
+    if user:
         session.commit()
         print(f"✅ User '{user.username}' is now an admin!")
+    else:
+        user = session.execute(
+            select(User.id, User.username, User.email, User.is_admin)
+            .where(User.username == "mknaepen")
+        ).first()
+        
+        if not user:
+            print("❌ User 'mknaepen' not found!")
+            sys.exit(1)
+        
+        print(f"✓ User '{user.username}' is already an admin")
     
     print(f"\nUser details:")
     print(f"  - Username: {user.username}")
@@ -11,8 +11,13 @@ from sqlmodel import select
 print("Checking admin access...\n")
 
 with get_session() as session:
+    # Fetch only the printed columns; no ORM objects are built
+    all_users = session.execute(
+        select(User.id, User.username, User.email, User.is_admin)
+    ).all()
+    
     # Check for admin users
-    admin_users = session.exec(select(User).where(User.is_admin == True)).all()
+    admin_users = [user for user in all_users if user.is_admin]
     
     print(f"Admin users found: {len(admin_users)}")
     if admin_users:
@@ -25,7 +30,6 @@ with get_session() as session:
         print("  2. Or manually set is_admin=True in the database")
     
     # List all users
-    all_users = session.exec(select(User)).all()
     print(f"\nAll users ({len(all_users)}):")
     for user in all_users:
         admin_badge = " [ADMIN]" if user.is_admin else ""
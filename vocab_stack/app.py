@@ -31,13 +31,16 @@ def require_auth(page):
     return protected_page
 
 
-# Use default theme (per-user theme can be implemented with client-side storage)
-user_theme = "light"
+def protected(page) -> rx.Component:
+    """Build a page's auth-guarded layout once, at import time."""
+    return layout(require_auth(page)())
 
-# Define the app with authentication middleware
+
+# The stored theme is applied by AuthState.apply_theme on each protected
+# page load, so no database read is needed to construct the app
 app = rx.App(
     theme=rx.theme(
-        appearance=user_theme,
+        appearance="inherit",
         accent_color="blue",
         radius="large",
     )
@@ -56,48 +59,25 @@ app.add_page(
     title="Register - Vocab App"
 )
 
-# Protected routes (require authentication)
-app.add_page(
-    lambda: layout(require_auth(dashboard_page)()),
-    route="/dashboard",
-    title="Dashboard - Vocab App",
-    on_load=[AuthState.on_load, DashboardState.on_mount],
-)
-
-app.add_page(
-    lambda: layout(require_auth(review_page)()),
-    route="/review",
-    title="Review - Vocab App",
-    on_load=[AuthState.on_load, ReviewState.on_mount],
-)
-
-app.add_page(
-    lambda: layout(require_auth(topics_page)()),
-    route="/topics",
-    title="Topics - Vocab App",
-    on_load=[AuthState.on_load, TopicState.on_mount],
-)
-
-app.add_page(
-    lambda: layout(require_auth(cards_page)()),
-    route="/cards",
-    title="Flashcards - Vocab App",
-    on_load=[AuthState.on_load, CardState.on_mount],
-)
+# Protected routes (require authentication): (page, route, title, state)
+PROTECTED_ROUTES = [
+    (dashboard_page, "/dashboard", "Dashboard", DashboardState),
+    (review_page, "/review", "Review", ReviewState),
+    (topics_page, "/topics", "Topics", TopicState),
+    (cards_page, "/cards", "Flashcards", CardState),
+    (statistics_page, "/statistics", "Statistics", StatsState),
+    (settings_page, "/settings", "Settings", SettingsState),
+]
 
-app.add_page(
-    lambda: layout(require_auth(statistics_page)()),
-    route="/statistics",
-    title="Statistics - Vocab App",
-    on_load=[AuthState.on_load, StatsState.on_mount],
-)
-
-app.add_page(
-    lambda: layout(require_auth(settings_page)()),
-    route="/settings",
-    title="Settings - Vocab App",
-    on_load=[AuthState.on_load, SettingsState.on_mount],
-)
+# Every protected load saves queued review answers before the page reads
+# card data, so no page shows progress without them
+for page, route, title, state in PROTECTED_ROUTES:
+    app.add_page(
+        protected(page),
+        route=route,
+        title=f"{title} - Vocab App",
+        on_load=[AuthState.on_load, AuthState.apply_theme, ReviewState.flush_reviews, state.on_mount],
+    )
 
 # Register admin routes
 register_admin_routes(app)
@@ -1,5 +1,7 @@
 """Navigation bar and layout components."""
 import reflex as rx
+from vocab_stack.pages.cards import CardState
+from vocab_stack.pages.dashboard import DashboardState
 
 
 def navbar() -> rx.Component:
@@ -9,10 +11,19 @@ def navbar() -> rx.Component:
             rx.heading("Vocab App", size="6"),
             rx.spacer(),
             rx.hstack(
-                rx.link(rx.button("Dashboard", variant="soft", size="2"), href="/dashboard"),
+                # Hovering starts loading the page's data before the click
+                rx.link(
+                    rx.button("Dashboard", variant="soft", size="2"),
+                    href="/dashboard",
+                    on_mouse_enter=DashboardState.prefetch,
+                ),
                 rx.link(rx.button("Review", variant="soft", size="2"), href="/review"),
                 rx.link(rx.button("Topics", variant="soft", size="2"), href="/topics"),
-                rx.link(rx.button("Cards", variant="soft", size="2"), href="/cards"),
+                rx.link(
+                    rx.button("Cards", variant="soft", size="2"),
+                    href="/cards",
+                    on_mouse_enter=CardState.prefetch,
+                ),
                 rx.link(rx.button("Statistics", variant="soft", size="2"), href="/statistics"),
                 rx.link(rx.button("Settings", variant="soft", size="2"), href="/settings"),
                 spacing="3",
@@ -1,13 +1,60 @@
 """Database initialization and helper functions."""
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import date
+from sqlalchemy import event, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel, create_engine, Session
 from vocab_stack.models import User, Topic, Flashcard, LeitnerState, ReviewHistory
 import reflex as rx
+from reflex.model import get_engine as get_reflex_engine
 
 # Get database URL from config
 DATABASE_URL = rx.config.get_config().db_url
 
-# Create engine
-engine = create_engine(DATABASE_URL, echo=True)  # echo=True for SQL logging
+# Create engine (set SQL_ECHO=1 to log every statement)
+_is_sqlite = DATABASE_URL.startswith("sqlite")
+engine = create_engine(
+    DATABASE_URL,
+    echo=os.getenv("SQL_ECHO") == "1",
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+)
+
+
+# Reflex's rx.session() uses its own engine for the same URL; the pragmas
+# are registered on both engines only, not on every Engine in the process
+_app_engines = (engine, get_reflex_engine(DATABASE_URL))
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Enable WAL, relaxed fsync and FK enforcement (ON DELETE CASCADE)."""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+for _app_engine in _app_engines:
+    event.listen(_app_engine, "connect", _set_sqlite_pragmas)
+
+
+# Objects stay loaded after commit (no re-SELECT on access)
+SessionLocal = sessionmaker(bind=engine, class_=Session, expire_on_commit=False)
+
+
+# SQLite settings for fast bulk inserts, on top of the connect-time
+# WAL + synchronous=NORMAL: pragma name -> bulk value
+SQLITE_BULK_PRAGMAS = {
+    "temp_store": "MEMORY",
+    "cache_size": "-65536",  # 64 MB
+}
 
 
 def create_db_and_tables():
@@ -17,11 +64,115 @@ def create_db_and_tables():
 
 
 def get_session():
-    """Get database session."""
-    return Session(engine)
+    """Get a new database session (use it as a context manager)."""
+    return SessionLocal()
 
 
 def drop_all_tables():
     """Drop all tables (use with caution!)"""
     SQLModel.metadata.drop_all(engine)
     print("⚠️  All tables dropped!")
+
+
+@contextmanager
+def tune_sqlite_for_bulk(session: Session):
+    """
+    Apply bulk-insert PRAGMAs to the session's SQLite connection.
+    
+    The PRAGMAs are set on the underlying DBAPI connection, which stays
+    the same across commits, and its previous values are restored on exit
+    (also on error) before it goes back to the pool. Does nothing on other
+    databases.
+    
+    Example:
+        >>> with get_session() as session, tune_sqlite_for_bulk(session):
+        ...     bulk_insert_flashcards(session, rows)
+        ...     session.commit()
+    """
+    if session.get_bind().dialect.name != "sqlite":
+        yield
+        return
+    
+    # Pin the pooled connection; session.connection() after a commit may
+    # hand out a different one
+    dbapi_connection = session.connection().connection.dbapi_connection
+    previous = {
+        name: dbapi_connection.execute(f"PRAGMA {name}").fetchone()[0]
+        for name in SQLITE_BULK_PRAGMAS
+    }
+    for name, value in SQLITE_BULK_PRAGMAS.items():
+        dbapi_connection.execute(f"PRAGMA {name}={value}")
+    
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            dbapi_connection.execute(f"PRAGMA {name}={value}")
+
+
+# Dialect-specific inserts that support ON CONFLICT DO NOTHING
+_ON_CONFLICT_INSERTS = {
+    "sqlite": sqlite_insert,
+    "postgresql": postgresql_insert,
+}
+
+
+def bulk_insert_flashcards(session: Session, rows: list[dict], ignore_duplicates: bool = False) -> list[int]:
+    """
+    Insert flashcards and their initial Leitner states with executemany.
+    
+    Args:
+        session: Open database session (caller commits)
+        rows: Flashcard column dicts (front, back, example, topic_id, user_id)
+        ignore_duplicates: Skip rows that already exist for the same
+                           (front, topic_id, user_id) instead of failing
+        
+    Returns:
+        List of created flashcard IDs. In the same order as rows unless
+        ignore_duplicates is set, in which case skipped rows are omitted.
+    """
+    if not rows:
+        return []
+    
+    dialect = session.get_bind().dialect
+    upsert_insert = _ON_CONFLICT_INSERTS.get(dialect.name)
+    if ignore_duplicates and upsert_insert is not None:
+        # INSERT ... ON CONFLICT DO NOTHING RETURNING id: the unique
+        # constraint dedupes in the same batch, only new IDs come back
+        card_ids = list(session.scalars(
+            upsert_insert(Flashcard).on_conflict_do_nothing().returning(Flashcard.id),
+            rows,
+        ))
+    elif ignore_duplicates:
+        # No ON CONFLICT support: insert row by row, each in a savepoint
+        card_ids = []
+        for row in rows:
+            try:
+                with session.begin_nested():
+                    card_ids.append(session.scalar(insert(Flashcard).returning(Flashcard.id), row))
+            except IntegrityError:
+                continue
+    elif dialect.insert_executemany_returning_sort_by_parameter_order:
+        # Batched INSERT ... RETURNING id (SQLite 3.35+); IDs come back in
+        # parameter order so they can be zipped with the Leitner rows
+        card_ids = list(session.scalars(
+            insert(Flashcard).returning(Flashcard.id, sort_by_parameter_order=True),
+            rows,
+        ))
+    else:
+        rows = [dict(row) for row in rows]
+        session.bulk_insert_mappings(Flashcard, rows, return_defaults=True)
+        card_ids = [row["id"] for row in rows]
+    
+    if not card_ids:
+        return []
+    
+    today = date.today()
+    session.execute(
+        insert(LeitnerState),
+        [
+            {"flashcard_id": card_id, "box_number": 1, "next_review_date": today}
+            for card_id in card_ids
+        ],
+    )
+    return card_ids
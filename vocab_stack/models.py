@@ -1,6 +1,7 @@
 """Database models for vocabulary learning app."""
 from typing import Optional, List
 from datetime import datetime, date
+from sqlalchemy import Index, UniqueConstraint
 from sqlmodel import Field, Relationship
 import reflex as rx
 
@@ -27,8 +28,11 @@ class User(rx.Model, table=True):
     daily_goal: int = Field(default=50, ge=10, le=200)
     answer_mode: str = Field(default="reveal")  # reveal, type
     
-    # Relationships
-    flashcards: List["Flashcard"] = Relationship(back_populates="user")
+    # Relationships (rows are removed by ON DELETE CASCADE in the database)
+    flashcards: List["Flashcard"] = Relationship(
+        back_populates="user",
+        sa_relationship_kwargs={"cascade": "all, delete-orphan", "passive_deletes": True},
+    )
 
 
 class Topic(rx.Model, table=True):
@@ -44,6 +48,13 @@ class Topic(rx.Model, table=True):
 
 class Flashcard(rx.Model, table=True):
     """Individual vocabulary flashcard."""
+    __table_args__ = (
+        Index("ix_fc_user_topic", "user_id", "topic_id"),
+        # Topic-only filters: review by topic, card list filter, topic delete
+        Index("ix_fc_topic", "topic_id"),
+        UniqueConstraint("front", "topic_id", "user_id", name="uq_flashcard_front_topic_user"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     front: str  # Question/word
     back: str   # Answer/definition
@@ -52,17 +63,29 @@ class Flashcard(rx.Model, table=True):
     
     # Foreign Keys
     topic_id: int = Field(foreign_key="topic.id")
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", ondelete="CASCADE")
     
     # Relationships
     topic: Topic = Relationship(back_populates="flashcards")
     user: User = Relationship(back_populates="flashcards")
-    review_history: List["ReviewHistory"] = Relationship(back_populates="flashcard")
-    leitner_state: Optional["LeitnerState"] = Relationship(back_populates="flashcard")
+    review_history: List["ReviewHistory"] = Relationship(
+        back_populates="flashcard",
+        sa_relationship_kwargs={"cascade": "all, delete-orphan", "passive_deletes": True},
+    )
+    leitner_state: Optional["LeitnerState"] = Relationship(
+        back_populates="flashcard",
+        sa_relationship_kwargs={"cascade": "all, delete-orphan", "passive_deletes": True},
+    )
 
 
 class LeitnerState(rx.Model, table=True):
     """Current Leitner box state for each flashcard."""
+    __table_args__ = (
+        Index("ix_leitner_due", "next_review_date"),
+        # Covers the due-card join and the per-box progress aggregate
+        Index("ix_ls_fc_due", "flashcard_id", "next_review_date", "box_number"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     box_number: int = Field(default=1, ge=1, le=5)  # Boxes 1-5
     next_review_date: date = Field(default_factory=date.today)
@@ -71,7 +94,7 @@ class LeitnerState(rx.Model, table=True):
     incorrect_count: int = Field(default=0, ge=0)
     
     # Foreign Key (One-to-One with Flashcard)
-    flashcard_id: int = Field(foreign_key="flashcard.id", unique=True)
+    flashcard_id: int = Field(foreign_key="flashcard.id", unique=True, ondelete="CASCADE")
     
     # Relationship
     flashcard: Flashcard = Relationship(back_populates="leitner_state")
@@ -79,14 +102,36 @@ class LeitnerState(rx.Model, table=True):
 
 class ReviewHistory(rx.Model, table=True):
     """Historical record of each review session."""
+    __table_args__ = (
+        # Per-user review counts and "reviews today" filters
+        Index("ix_rh_user_date", "user_id", "review_date"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     review_date: datetime = Field(default_factory=datetime.utcnow)
     was_correct: bool
     time_spent_seconds: Optional[int] = Field(default=None, ge=0)
     
     # Foreign Keys
-    flashcard_id: int = Field(foreign_key="flashcard.id")
-    user_id: int = Field(foreign_key="user.id")
+    flashcard_id: int = Field(foreign_key="flashcard.id", ondelete="CASCADE")
+    user_id: int = Field(foreign_key="user.id", ondelete="CASCADE")
     
     # Relationships
     flashcard: Flashcard = Relationship(back_populates="review_history")
+
+
+class DailyReviewCount(rx.Model, table=True):
+    """Number of reviews a user did on a (UTC) day, kept by LeitnerService."""
+    user_id: int = Field(foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    review_day: date = Field(primary_key=True)
+    count: int = 0
+
+
+class UserStats(rx.Model, table=True):
+    """Per-user aggregates for the admin dashboard, refreshed periodically."""
+    user_id: int = Field(foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    total_cards: int = 0
+    reviews_today: int = 0
+    reviews_total: int = 0
+    current_streak: int = 0
+    refreshed_at: datetime = Field(default_factory=datetime.utcnow)
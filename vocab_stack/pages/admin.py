@@ -1,23 +1,179 @@
 """Admin dashboard for monitoring users."""
+import asyncio
 import reflex as rx
-from sqlmodel import select
-from typing import List
-from vocab_stack.models import User, Flashcard
+from sqlalchemy import delete, insert, update
+from datetime import datetime
+from sqlmodel import select, func
+from typing import Dict, List
+from vocab_stack.models import User, Flashcard, ReviewHistory, UserStats
 from vocab_stack.database import get_session
+from vocab_stack.services import token_cache
+from vocab_stack.services.auth_service import AuthService
 from vocab_stack.services.statistics_service import StatisticsService
 from vocab_stack.pages.auth import AuthState
 
 
+# The user grid reads per-user aggregates from the userstats table, which is
+# rebuilt from the source tables once it is older than the TTL. The table is
+# shared by every admin session and every app worker.
+USER_STATS_TTL_SECONDS = 30
+
+
+def _compute_summary() -> tuple[int, int, int]:
+    """
+    Count users, flashcards and today's active users in SQL.
+    
+    Returns:
+        Tuple of (total_users, total_cards, active_users_today)
+    """
+    today = datetime.utcnow().date()
+    with get_session() as session:
+        # Three scalar subqueries, fetched in a single round trip
+        total_users, total_cards, active_today = session.execute(
+            select(
+                select(func.count(User.id)).scalar_subquery(),
+                select(func.count(Flashcard.id)).scalar_subquery(),
+                select(func.count(func.distinct(ReviewHistory.user_id)))
+                .where(func.date(ReviewHistory.review_date) == today)
+                .scalar_subquery(),
+            )
+        ).one()
+    return total_users, total_cards, active_today
+
+
+def _load_card_counts() -> dict:
+    """Count flashcards for every user in one grouped query."""
+    with get_session() as session:
+        return dict(session.exec(
+            select(Flashcard.user_id, func.count(Flashcard.id))
+            .group_by(Flashcard.user_id)
+        ).all())
+
+
+def _user_stats_stale() -> bool:
+    """Check whether the userstats table is empty or past its TTL."""
+    with get_session() as session:
+        refreshed_at = session.scalar(select(func.min(UserStats.refreshed_at)))
+    if refreshed_at is None:
+        return True
+    age = datetime.utcnow() - refreshed_at
+    return age.total_seconds() >= USER_STATS_TTL_SECONDS
+
+
+def _write_user_stats(card_counts: dict, stats_map: Dict[int, dict]):
+    """Replace the contents of the userstats table in one transaction."""
+    now = datetime.utcnow()
+    with get_session() as session:
+        user_ids = session.exec(select(User.id)).all()
+        session.execute(delete(UserStats))
+        if user_ids:
+            session.execute(insert(UserStats), [
+                {
+                    "user_id": user_id,
+                    "total_cards": card_counts.get(user_id, 0),
+                    "reviews_today": stats_map.get(user_id, {}).get("reviews_today", 0),
+                    "reviews_total": stats_map.get(user_id, {}).get("total_reviews", 0),
+                    "current_streak": stats_map.get(user_id, {}).get("current_streak", 0),
+                    "refreshed_at": now,
+                }
+                for user_id in user_ids
+            ])
+        session.commit()
+
+
+async def _refresh_user_stats():
+    """
+    Rebuild the userstats table.
+    
+    The card counts and review statistics don't depend on each other, so
+    both queries run at the same time in worker threads. Each helper opens
+    its own session (get_session() or rx.session()), so no session is
+    shared between threads.
+    """
+    card_counts, stats_map = await asyncio.gather(
+        asyncio.to_thread(_load_card_counts),
+        asyncio.to_thread(StatisticsService.get_overview_for_users, None),
+    )
+    await asyncio.to_thread(_write_user_stats, card_counts, stats_map)
+
+
+def _load_user_rows(offset: int, limit: int) -> List[dict]:
+    """
+    Read one page of the admin user list with one SELECT joined to userstats.
+    
+    Args:
+        offset: Number of users to skip, in user ID order
+        limit: Maximum number of users to return
+        
+    Returns:
+        List of user dicts for the dashboard grid
+    """
+    with get_session() as session:
+        # Core rows as mappings: no ORM objects or identity map, and the
+        # password hash, session token and preferences are never read
+        rows = session.execute(
+            select(
+                User.id,
+                User.username,
+                User.email,
+                User.created_at,
+                User.is_admin,
+                User.last_login,
+                UserStats.total_cards,
+                UserStats.reviews_today,
+                UserStats.reviews_total,
+                UserStats.current_streak,
+            )
+            .outerjoin(UserStats, UserStats.user_id == User.id)
+            .order_by(User.id)
+            .offset(offset)
+            .limit(limit)
+        ).mappings().all()
+    
+    users_list: List[dict] = []
+    for row in rows:
+        last_login = row["last_login"]
+        last_login_str = last_login.strftime("%Y-%m-%d %H:%M") if last_login else "Never"
+        
+        # Users created since the last refresh have no userstats row yet
+        users_list.append({
+            "id": row["id"],
+            "username": row["username"],
+            "email": row["email"],
+            "created_at": row["created_at"],
+            # Counts are display-only, so they are sent as strings
+            "total_cards": str(row["total_cards"] or 0),
+            "reviews_today": str(row["reviews_today"] or 0),
+            "reviews_total": str(row["reviews_total"] or 0),
+            "streak": str(row["current_streak"] or 0),
+            "is_admin": row["is_admin"],
+            "last_login": last_login_str,
+            # Display strings, so user_card does no formatting
+            "email_label": f"Email: {row['email']}",
+            "last_login_label": f"Last Login: {last_login_str}",
+        })
+    
+    return users_list
+
+
 class AdminState(rx.State):
     """Admin state for managing and monitoring users."""
     
     # User management
     users: List[dict] = []
     total_users: int = 0
+    active_users_today: int = 0
+    total_cards_all_users: int = 0
     loading: bool = False
     
+    # User grid pagination (total_users comes from load_summary)
+    page: int = 0
+    page_size: int = 25
+    
     # Permissions
     is_admin: bool = False
+    # Backend-only copy of AuthState.current_user_id, refreshed on mount
+    _current_user_id: int = 0
     
     # UI state
     success_message: str = ""
@@ -37,53 +193,55 @@ class AdminState(rx.State):
         auth = await self.get_state(AuthState)
         if auth.is_logged_in and auth.is_admin:
             self.is_admin = True
-            self.load_user_stats()
+            self._current_user_id = auth.current_user_id
+            # Send the headline counts first, then build the user list
+            self.load_summary()
+            yield
+            await self.load_user_stats()
         else:
             # This will redirect to dashboard since page is protected
             pass
 
-    def load_user_stats(self):
+    def load_summary(self):
+        """Load the dashboard totals with COUNT queries."""
+        if not self.is_admin:
+            return
+        (
+            self.total_users,
+            self.total_cards_all_users,
+            self.active_users_today,
+        ) = _compute_summary()
+    
+    async def load_user_stats(self):
+        """Load the per-user details shown in the user grid."""
         if not self.is_admin:
             return
             
         self.loading = True
-        users_list: List[dict] = []
         
-        with get_session() as session:
-            all_users = session.exec(select(User)).all()
-            for user in all_users:
-                # Get user statistics
-                stats = StatisticsService.get_user_overview(user.id)
-                total_cards = len(session.exec(
-                    select(Flashcard).where(Flashcard.user_id == user.id)
-                ).all())
-                
-                users_list.append({
-                    "id": user.id,
-                    "username": user.username,
-                    "email": user.email,
-                    "created_at": user.created_at,
-                    "total_cards": total_cards,
-                    "reviews_today": stats.get("reviews_today", 0),
-                    "reviews_total": stats.get("total_reviews", 0),
-                    "streak": stats.get("current_streak", 0),
-                    "is_admin": user.is_admin,
-                    "last_login": user.last_login.strftime("%Y-%m-%d %H:%M") if user.last_login else "Never",
-                })
+        if await asyncio.to_thread(_user_stats_stale):
+            await _refresh_user_stats()
+        
+        # Stay on the last page if users were deleted from under it
+        last_page = max(0, (self.total_users - 1) // self.page_size)
+        self.page = min(self.page, last_page)
         
-        self.users = users_list
-        self.total_users = len(users_list)
+        self.users = await asyncio.to_thread(
+            _load_user_rows, self.page * self.page_size, self.page_size
+        )
         self.loading = False
     
-    @rx.var
-    def active_users_today(self) -> int:
-        """Count of users who reviewed cards today."""
-        return sum(1 for user in self.users if user.get("reviews_today", 0) > 0)
+    async def next_page(self):
+        """Show the next page of users."""
+        if (self.page + 1) * self.page_size < self.total_users:
+            self.page += 1
+            await self.load_user_stats()
     
-    @rx.var
-    def total_cards_all_users(self) -> int:
-        """Total cards across all users."""
-        return sum(user.get("total_cards", 0) for user in self.users)
+    async def prev_page(self):
+        """Show the previous page of users."""
+        if self.page > 0:
+            self.page -= 1
+            await self.load_user_stats()
     
     # Password Reset Methods
     def show_password_reset(self, user_id: int, username: str):
@@ -100,7 +258,7 @@ class AdminState(rx.State):
         self.reset_username = ""
         self.new_password = ""
     
-    def reset_user_password(self):
+    async def reset_user_password(self):
         """Reset a user's password."""
         if not self.is_admin or self.reset_user_id == -1:
             return
@@ -109,14 +267,17 @@ class AdminState(rx.State):
             self.error_message = "Password must be at least 6 characters"
             return
         
-        from vocab_stack.services.auth_service import AuthService
+        # bcrypt is deliberately slow and releases the GIL; hash in a worker
+        # thread so the event loop keeps serving other events
+        password_hash = await asyncio.to_thread(AuthService.hash_password, self.new_password)
         
         with get_session() as session:
-            user = session.get(User, self.reset_user_id)
-            if user:
-                # Hash the new password
-                user.password_hash = AuthService.hash_password(self.new_password)
-                session.add(user)
+            result = session.execute(
+                update(User)
+                .where(User.id == self.reset_user_id)
+                .values(password_hash=password_hash)
+            )
+            if result.rowcount:
                 session.commit()
                 
                 self.success_message = f"Password reset for {self.reset_username}"
@@ -124,6 +285,7 @@ class AdminState(rx.State):
                 self.reset_username = ""
                 self.new_password = ""
             else:
+                session.rollback()
                 self.error_message = "User not found"
     
     # User Deletion Methods
@@ -145,50 +307,28 @@ class AdminState(rx.State):
             return
         
         # Don't allow deleting yourself
-        auth = await self.get_state(AuthState)
-        if self.delete_user_id == auth.current_user_id:
+        if self.delete_user_id == self._current_user_id:
             self.error_message = "You cannot delete your own account"
             return
         
-        from vocab_stack.models import LeitnerState, ReviewHistory
-        
         with get_session() as session:
-            # Get all flashcards for this user
-            flashcards = session.exec(
-                select(Flashcard).where(Flashcard.user_id == self.delete_user_id)
-            ).all()
-            
-            # Delete related records
-            for flashcard in flashcards:
-                # Delete LeitnerState records
-                leitner_states = session.exec(
-                    select(LeitnerState).where(LeitnerState.flashcard_id == flashcard.id)
-                ).all()
-                for state in leitner_states:
-                    session.delete(state)
-                
-                # Delete ReviewHistory records
-                review_histories = session.exec(
-                    select(ReviewHistory).where(ReviewHistory.flashcard_id == flashcard.id)
-                ).all()
-                for history in review_histories:
-                    session.delete(history)
-                
-                # Delete the flashcard
-                session.delete(flashcard)
-            
-            # Delete the user
-            user = session.get(User, self.delete_user_id)
-            if user:
-                session.delete(user)
+            # Flashcards, Leitner states and review history go with the
+            # user via ON DELETE CASCADE
+            result = session.execute(delete(User).where(User.id == self.delete_user_id))
+            if result.rowcount:
                 session.commit()
+                token_cache.invalidate_user(self.delete_user_id)
                 
                 self.success_message = f"User {self.delete_username} deleted successfully"
                 self.delete_user_id = -1
                 self.delete_username = ""
-                self.load_user_stats()
             else:
+                session.rollback()
                 self.error_message = "User not found"
+                return
+        
+        self.load_summary()
+        await self.load_user_stats()
     
     # Admin Role Management
     async def toggle_admin(self, user_id: int):
@@ -197,23 +337,50 @@ class AdminState(rx.State):
             return
         
         # Don't allow removing your own admin status
-        auth = await self.get_state(AuthState)
-        if user_id == auth.current_user_id:
+        if user_id == self._current_user_id:
             self.error_message = "You cannot change your own admin status"
             return
         
         with get_session() as session:
-            user = session.get(User, user_id)
-            if user:
-                user.is_admin = not user.is_admin
-                session.add(user)
+            # Flip the flag in SQL and read back what the message needs
+            row = session.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(is_admin=~User.is_admin)
+                .returning(User.username, User.is_admin)
+            ).first()
+            if row:
                 session.commit()
+                # Cached sessions carry is_admin
+                token_cache.invalidate_user(user_id)
                 
-                status = "granted" if user.is_admin else "revoked"
-                self.success_message = f"Admin access {status} for {user.username}"
-                self.load_user_stats()
+                username, is_admin = row
+                status = "granted" if is_admin else "revoked"
+                self.success_message = f"Admin access {status} for {username}"
             else:
+                session.rollback()
                 self.error_message = "User not found"
+                return
+        
+        await self.load_user_stats()
+
+
+# (label, user dict key) for the stat cells on each user card
+USER_STAT_FIELDS = (
+    ("Total Cards", "total_cards"),
+    ("Reviews (Today)", "reviews_today"),
+    ("Total Reviews", "reviews_total"),
+    ("Current Streak", "streak"),
+)
+
+
+def user_stat_cell(label: str, value) -> rx.Component:
+    """Display one labelled stat on a user card."""
+    return rx.vstack(
+        rx.text(label, size="2", color="gray"),
+        rx.heading(value, size="6"),
+        align="start",
+    )
 
 
 def user_card(user: dict) -> rx.Component:
@@ -230,30 +397,14 @@ def user_card(user: dict) -> rx.Component:
                 ),
                 width="100%",
             ),
-            rx.text(f"Email: {user['email']}", color="gray", size="2"),
-            rx.text(f"Last Login: {user['last_login']}", color="gray", size="1"),
+            rx.text(user["email_label"], color="gray", size="2"),
+            rx.text(user["last_login_label"], color="gray", size="1"),
             rx.divider(),
             rx.grid(
-                rx.vstack(
-                    rx.text("Total Cards", size="2", color="gray"),
-                    rx.heading(user["total_cards"].to_string(), size="6"),
-                    align="start",
-                ),
-                rx.vstack(
-                    rx.text("Reviews (Today)", size="2", color="gray"),
-                    rx.heading(user["reviews_today"].to_string(), size="6"),
-                    align="start",
-                ),
-                rx.vstack(
-                    rx.text("Total Reviews", size="2", color="gray"),
-                    rx.heading(user["reviews_total"].to_string(), size="6"),
-                    align="start",
-                ),
-                rx.vstack(
-                    rx.text("Current Streak", size="2", color="gray"),
-                    rx.heading(user["streak"].to_string(), size="6"),
-                    align="start",
-                ),
+                *[
+                    user_stat_cell(label, user[key])
+                    for label, key in USER_STAT_FIELDS
+                ],
                 columns="4",
                 spacing="4",
             ),
@@ -468,6 +619,31 @@ def admin_dashboard_page() -> rx.Component:
                             spacing="4",
                             width="100%",
                         ),
+                        rx.hstack(
+                            rx.button(
+                                "Previous",
+                                on_click=AdminState.prev_page,
+                                disabled=AdminState.page == 0,
+                                variant="soft",
+                                size="2",
+                            ),
+                            rx.text(
+                                "Page ",
+                                AdminState.page + 1,
+                                color="gray",
+                                size="2",
+                            ),
+                            rx.button(
+                                "Next",
+                                on_click=AdminState.next_page,
+                                disabled=(AdminState.page + 1) * AdminState.page_size >= AdminState.total_users,
+                                variant="soft",
+                                size="2",
+                            ),
+                            justify="center",
+                            align="center",
+                            width="100%",
+                        ),
                         width="100%",
                         spacing="4",
                     ),
@@ -527,7 +703,7 @@ def register_admin_routes(app):
     
     # Add admin routes
     app.add_page(
-        lambda: require_auth(require_admin(admin_dashboard_page))(),
+        require_auth(require_admin(admin_dashboard_page))(),
         route="/admin",
         title="Admin Dashboard - Vocab App",
         on_load=[AuthState.on_load, AdminState.on_mount],
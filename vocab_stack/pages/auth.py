@@ -2,6 +2,23 @@
 
 import reflex as rx
 
+from vocab_stack.services import token_cache
+from vocab_stack.services.auth_service import AuthService
+
+# Issued tokens are at least secrets.token_urlsafe(32) long
+MIN_TOKEN_LENGTH = 43
+
+
+def apply_theme_script(theme: str) -> str:
+    """Client-side script that applies and remembers the colour theme."""
+    theme = "dark" if theme == "dark" else "light"
+    return (
+        f"localStorage.setItem('theme', '{theme}');"
+        f"document.documentElement.classList.remove('light', 'dark');"
+        f"document.documentElement.classList.add('{theme}');"
+        f"document.documentElement.dataset.theme = '{theme}';"
+    )
+
 
 class AuthState(rx.State):
     """Authentication state for managing user login/registration."""
@@ -25,20 +42,54 @@ class AuthState(rx.State):
     # Session token stored as cookie
     session_token: str = rx.Cookie(name="session_token", max_age=2592000)  # 30 days
 
+    # Colour theme, kept in the browser so cached-token loads need no query
+    theme: str = rx.LocalStorage("light", name="theme")
+
     def on_load(self):
         """Check authentication on every page load."""
-        from vocab_stack.services.auth_service import AuthService
+        # Anonymous visitors (no or malformed cookie) skip all auth work
+        if len(self.session_token) < MIN_TOKEN_LENGTH:
+            self._set_anonymous()
+            return
 
-        if self.session_token:
+        # Recently validated tokens skip the database
+        cached = token_cache.get(self.session_token)
+        if cached:
+            self.current_user_id = cached.id
+            self.username = cached.username
+            self.is_admin = cached.is_admin
+            self.is_logged_in = True
+            return
+
+        # Forged or expired signed tokens are rejected without a query
+        if AuthService.check_token_signature(self.session_token):
             user = AuthService.validate_token(self.session_token)
-            if user:
-                self.current_user_id = user.id
-                self.username = user.username
-                self.is_admin = user.is_admin
-                self.is_logged_in = True
-                return
-
-        # Not logged in
+        else:
+            user = None
+        if user:
+            token_cache.put(
+                self.session_token,
+                user.id,
+                user.username,
+                user.is_admin,
+                user.token_expires,
+            )
+            self.current_user_id = user.id
+            self.username = user.username
+            self.is_admin = user.is_admin
+            self.theme = user.theme
+            self.is_logged_in = True
+            return
+
+        self._set_anonymous()
+
+    def apply_theme(self):
+        """Apply the user's stored colour theme (every protected page load)."""
+        if self.is_logged_in:
+            return rx.call_script(apply_theme_script(self.theme))
+
+    def _set_anonymous(self):
+        """Reset the current user fields to the logged-out state."""
         self.is_logged_in = False
         self.current_user_id = 0
         self.username = ""
@@ -46,8 +97,6 @@ class AuthState(rx.State):
 
     def register(self) -> rx.event:
         """Register a new user."""
-        from vocab_stack.services.auth_service import AuthService
-
         # Clear previous messages
         self.error_message = ""
         self.success_message = ""
@@ -69,6 +118,7 @@ class AuthState(rx.State):
             self.current_user_id = user.id
             self.username = user.username
             self.is_admin = user.is_admin
+            self.theme = user.theme
             self.is_logged_in = True
             self.error_message = ""
 
@@ -85,8 +135,6 @@ class AuthState(rx.State):
 
     def login(self) -> rx.event:
         """Log in an existing user."""
-        from vocab_stack.services.auth_service import AuthService
-
         # Clear previous messages
         self.error_message = ""
         self.success_message = ""
@@ -102,6 +150,7 @@ class AuthState(rx.State):
             self.current_user_id = user.id
             self.username = user.username
             self.is_admin = user.is_admin
+            self.theme = user.theme
             self.is_logged_in = True
             self.error_message = ""
 
@@ -116,15 +165,12 @@ class AuthState(rx.State):
 
     def logout(self) -> rx.event:
         """Log out the current user."""
-        from vocab_stack.services.auth_service import AuthService
-
+        if self.session_token:
+            token_cache.invalidate(self.session_token)
         if self.current_user_id:
             AuthService.logout(self.current_user_id)
 
-        self.is_logged_in = False
-        self.current_user_id = 0
-        self.username = ""
-        self.is_admin = False
+        self._set_anonymous()
         self.session_token = ""  # Clear the cookie
 
         return rx.redirect("/")
@@ -1,11 +1,86 @@
 """Flashcard management page."""
+import time
 import reflex as rx
 from vocab_stack.models import Flashcard, Topic, LeitnerState
 from vocab_stack.services.leitner_service import LeitnerService
+from vocab_stack.pages.auth import AuthState
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from datetime import date
 
 
+# A prefetch (nav link hover) is reused by on_mount within this window
+PREFETCH_WINDOW_SECONDS = 10
+
+
+def _integrity_message(error: IntegrityError) -> str:
+    """User-facing message for a failed card insert or update."""
+    if "UNIQUE" in str(error.orig).upper():
+        return "A card with this front already exists in this topic"
+    # Foreign key: the topic (or owner) was deleted meanwhile
+    return "The selected topic no longer exists"
+
+
+# Card list pages shared by every session, keyed by (topic_id, page,
+# page_size). An entry is current while its version matches
+# LeitnerService.card_data_version(), which every card or review change bumps.
+_card_page_cache: dict[tuple[int, int, int], tuple[int, list[dict], bool]] = {}
+
+
+def _load_card_page(topic_id: int, page: int, page_size: int) -> tuple[list[dict], bool]:
+    """
+    Query one page of the card list, newest first.
+    
+    Rows carry topic_id only; load_cards adds topic names from the loaded
+    topics, so no Topic rows are joined or loaded here.
+    
+    Args:
+        topic_id: Topic to filter by, or -1 for all topics
+        page: Zero-based page number
+        page_size: Cards per page
+        
+    Returns:
+        Tuple of (card row dicts, whether a next page exists)
+    """
+    with rx.session() as session:
+        query = select(
+            Flashcard.id,
+            Flashcard.front,
+            Flashcard.back,
+            Flashcard.example,
+            Flashcard.topic_id,
+        )
+        if topic_id > 0:
+            query = query.where(Flashcard.topic_id == topic_id)
+        
+        # One extra row tells whether there is a next page
+        cards_data = session.exec(
+            query.order_by(Flashcard.id.desc())
+            .offset(page * page_size)
+            .limit(page_size + 1)
+        ).all()
+        has_next_page = len(cards_data) > page_size
+        cards_data = cards_data[:page_size]
+        
+        # One batched lookup instead of a query per card
+        all_stats = LeitnerService.get_states_for([card.id for card in cards_data])
+        
+        rows = []
+        for card in cards_data:
+            stats = all_stats.get(card.id, {})
+            rows.append({
+                "id": card.id,
+                "front": card.front,
+                "back": card.back,
+                "example": card.example or "",
+                "topic_id": card.topic_id,
+                "box": stats.get("box_number", 1),
+                "accuracy": int(stats.get("accuracy", 0)),
+            })
+    
+    return rows, has_next_page
+
+
 class CardState(rx.State):
     """State for card management."""
     
@@ -13,6 +88,11 @@ class CardState(rx.State):
     topics: list[dict] = []
     selected_topic_id: int = -1
     
+    # Pagination (newest cards first)
+    page: int = 0
+    page_size: int = 50
+    has_next_page: bool = False
+    
     # Form fields
     new_front: str = ""
     new_back: str = ""
@@ -32,50 +112,70 @@ class CardState(rx.State):
     error_message: str = ""
     has_cards: bool = False
     topic_names: list[str] = []
+    # Backend-only lookup for select_topic_by_name
+    _topic_name_to_id: dict[str, int] = {}
+    # Backend-only: when prefetch last loaded the data
+    _prefetched_at: float = 0.0
     
     async def on_mount(self):
         """Load data on page mount."""
+        # Data loaded by a hover prefetch a moment ago is used once
+        if time.monotonic() - self._prefetched_at < PREFETCH_WINDOW_SECONDS:
+            self._prefetched_at = 0.0
+            return
+        
+        self.page = 0
+        self.load_topics()
+        self.load_cards()
+    
+    def prefetch(self):
+        """Load the card list ahead of navigation (nav link hover)."""
+        if time.monotonic() - self._prefetched_at < PREFETCH_WINDOW_SECONDS:
+            return
+        
+        self.page = 0
         self.load_topics()
         self.load_cards()
+        self._prefetched_at = time.monotonic()
     
     def load_topics(self):
         """Load all topics for dropdown."""
         with rx.session() as session:
-            topics_data = session.exec(select(Topic)).all()
-            self.topics = [
-                {"id": t.id, "name": t.name}
-                for t in topics_data
-            ]
-            self.topic_names = [t.name for t in topics_data]
+            # Only the two columns the dropdown needs
+            rows = session.exec(select(Topic.id, Topic.name)).all()
+        
+        self.topics = [{"id": topic_id, "name": name} for topic_id, name in rows]
+        self.topic_names = [name for _, name in rows]
+        self._topic_name_to_id = {name: topic_id for topic_id, name in rows}
     
     def load_cards(self, topic_id: int = None):
         """Load flashcards, optionally filtered by topic."""
         self.loading = True
         
-        with rx.session() as session:
-            query = select(Flashcard)
-            
-            if topic_id and topic_id > 0:
-                query = query.where(Flashcard.topic_id == topic_id)
-                self.selected_topic_id = topic_id
-            
-            cards_data = session.exec(query).all()
-            
-            self.cards = []
-            for card in cards_data:
-                stats = LeitnerService.get_card_statistics(card.id)
-                self.cards.append({
-                    "id": card.id,
-                    "front": card.front,
-                    "back": card.back,
-                    "example": card.example or "",
-                    "topic_name": card.topic.name,
-                    "topic_id": card.topic_id,
-                    "box": stats.get("box_number", 1),
-                    "accuracy": int(stats.get("accuracy", 0)),
-                })
-            
-            self.has_cards = len(self.cards) > 0
+        if topic_id and topic_id > 0:
+            self.selected_topic_id = topic_id
+        else:
+            self.selected_topic_id = -1
+        
+        key = (self.selected_topic_id, self.page, self.page_size)
+        version = LeitnerService.card_data_version()
+        cached = _card_page_cache.get(key)
+        if cached is None or cached[0] != version:
+            # Pages cached under an older version are stale too
+            for stale in [k for k, v in _card_page_cache.items() if v[0] != version]:
+                del _card_page_cache[stale]
+            cached = (version, *_load_card_page(self.selected_topic_id, self.page, self.page_size))
+            _card_page_cache[key] = cached
+        
+        # Copies, so in-place row patches don't touch the shared cache
+        _, rows, has_next_page = cached
+        id_to_name = {topic["id"]: topic["name"] for topic in self.topics}
+        self.cards = [
+            {**row, "topic_name": id_to_name.get(row["topic_id"], "")}
+            for row in rows
+        ]
+        self.has_next_page = has_next_page
+        self.has_cards = len(self.cards) > 0
         
         self.loading = False
     
@@ -89,8 +189,8 @@ class CardState(rx.State):
             self.new_example = ""
             self.new_topic_id = -1
     
-    def create_card(self):
-        """Create a new flashcard."""
+    async def create_card(self):
+        """Create a new flashcard owned by the logged-in user."""
         if not self.new_front.strip():
             self.error_message = "Front text is required"
             return
@@ -103,35 +203,65 @@ class CardState(rx.State):
             self.error_message = "Please select a topic"
             return
         
+        auth = await self.get_state(AuthState)
+        if not auth.current_user_id:
+            self.error_message = "Please log in to create cards"
+            return
+        user_id = auth.current_user_id
+        
         with rx.session() as session:
-            # Create flashcard (user_id=1 for demo)
+            # The initial Leitner state goes in through the relationship
+            # cascade, so both rows are inserted by the single flush on commit
             card = Flashcard(
                 front=self.new_front,
                 back=self.new_back,
                 example=self.new_example if self.new_example else None,
                 topic_id=self.new_topic_id,
-                user_id=1,
+                user_id=user_id,
+                leitner_state=LeitnerState(
+                    box_number=1,
+                    next_review_date=date.today(),
+                ),
             )
             session.add(card)
-            session.flush()
-            
-            # Create initial Leitner state
-            leitner = LeitnerState(
-                flashcard_id=card.id,
-                box_number=1,
-                next_review_date=date.today(),
-            )
-            session.add(leitner)
-            session.commit()
+            try:
+                session.flush()
+                card_id = card.id
+                session.commit()
+            except IntegrityError as e:
+                session.rollback()
+                self.error_message = _integrity_message(e)
+                return
+        
+        LeitnerService.invalidate_user_progress(user_id)
         
-        # Reset form and reload
+        # Add the new card to the first page if it matches the filter; a new
+        # card is in Box 1 with no reviews, so there is nothing to query
+        if self.page == 0 and (
+            self.selected_topic_id <= 0 or self.selected_topic_id == self.new_topic_id
+        ):
+            self.cards.insert(0, {
+                "id": card_id,
+                "front": self.new_front,
+                "back": self.new_back,
+                "example": self.new_example,
+                "topic_name": self._topic_name(self.new_topic_id),
+                "topic_id": self.new_topic_id,
+                "box": 1,
+                "accuracy": 0,
+            })
+            if len(self.cards) > self.page_size:
+                self.cards.pop()
+                self.has_next_page = True
+            self.has_cards = True
+        
+        # Reset form
         self.new_front = ""
         self.new_back = ""
         self.new_example = ""
         self.new_topic_id = -1
         self.show_create_form = False
         self.error_message = ""
-        self.load_cards(self.selected_topic_id if self.selected_topic_id > 0 else None)
     
     def start_edit(self, card_id: int, front: str, back: str, example: str, topic_id: int):
         """Start editing a card."""
@@ -160,35 +290,76 @@ class CardState(rx.State):
                 card.back = self.edit_back
                 card.example = self.edit_example if self.edit_example else None
                 card.topic_id = self.edit_topic_id
+                user_id = card.user_id
                 session.add(card)
-                session.commit()
+                try:
+                    session.commit()
+                except IntegrityError as e:
+                    session.rollback()
+                    self.error_message = _integrity_message(e)
+                    return
+                LeitnerService.invalidate_user_progress(user_id)
+        
+        # Patch the edited row in place; drop it if it left the filtered topic
+        if self.selected_topic_id > 0 and self.edit_topic_id != self.selected_topic_id:
+            self.cards = [c for c in self.cards if c["id"] != self.editing_card_id]
+        else:
+            for c in self.cards:
+                if c["id"] == self.editing_card_id:
+                    c["front"] = self.edit_front
+                    c["back"] = self.edit_back
+                    c["example"] = self.edit_example
+                    c["topic_id"] = self.edit_topic_id
+                    c["topic_name"] = self._topic_name(self.edit_topic_id)
+                    break
+        self.has_cards = len(self.cards) > 0
         
         self.editing_card_id = -1
         self.error_message = ""
-        self.load_cards(self.selected_topic_id if self.selected_topic_id > 0 else None)
     
     def delete_card(self, card_id: int):
         """Delete a flashcard."""
         with rx.session() as session:
             card = session.get(Flashcard, card_id)
             if card:
+                user_id = card.user_id
                 session.delete(card)
                 session.commit()
+                LeitnerService.invalidate_user_progress(user_id)
         
-        self.load_cards(self.selected_topic_id if self.selected_topic_id > 0 else None)
+        self.cards = [c for c in self.cards if c["id"] != card_id]
+        self.has_cards = len(self.cards) > 0
+        if not self.cards and self.page > 0:
+            self.prev_page()
+    
+    def next_page(self):
+        """Show the next page of cards."""
+        if self.has_next_page:
+            self.page += 1
+            self.load_cards(self.selected_topic_id)
+    
+    def prev_page(self):
+        """Show the previous page of cards."""
+        if self.page > 0:
+            self.page -= 1
+            self.load_cards(self.selected_topic_id)
     
     def filter_by_topic(self, topic_id: str):
         """Filter cards by topic."""
         topic_id_int = int(topic_id) if topic_id else -1
+        self.page = 0
         self.load_cards(topic_id_int if topic_id_int > 0 else None)
     
+    def _topic_name(self, topic_id: int) -> str:
+        """Name of a loaded topic, for patching card rows."""
+        for topic in self.topics:
+            if topic["id"] == topic_id:
+                return topic["name"]
+        return ""
+    
     def select_topic_by_name(self, topic_name: str):
         """Select a topic by name for the new card form."""
-        for topic in self.topics:
-            if topic["name"] == topic_name:
-                self.new_topic_id = topic["id"]
-                return
-        self.new_topic_id = -1
+        self.new_topic_id = self._topic_name_to_id.get(topic_name, -1)
 
 
 def card_row(card: dict) -> rx.Component:
@@ -336,20 +507,43 @@ def cards_page() -> rx.Component:
             rx.spinner(size="3"),
             rx.cond(
                 CardState.has_cards,
-                rx.table.root(
-                    rx.table.header(
-                        rx.table.row(
-                            rx.table.column_header_cell("Front"),
-                            rx.table.column_header_cell("Back"),
-                            rx.table.column_header_cell("Example"),
-                            rx.table.column_header_cell("Topic"),
-                            rx.table.column_header_cell("Box"),
-                            rx.table.column_header_cell("Accuracy"),
-                            rx.table.column_header_cell("Actions"),
+                rx.vstack(
+                    rx.table.root(
+                        rx.table.header(
+                            rx.table.row(
+                                rx.table.column_header_cell("Front"),
+                                rx.table.column_header_cell("Back"),
+                                rx.table.column_header_cell("Example"),
+                                rx.table.column_header_cell("Topic"),
+                                rx.table.column_header_cell("Box"),
+                                rx.table.column_header_cell("Accuracy"),
+                                rx.table.column_header_cell("Actions"),
+                            ),
+                        ),
+                        rx.table.body(
+                            rx.foreach(CardState.cards, card_row),
                         ),
+                        width="100%",
                     ),
-                    rx.table.body(
-                        rx.foreach(CardState.cards, card_row),
+                    rx.hstack(
+                        rx.button(
+                            "Previous",
+                            on_click=CardState.prev_page,
+                            disabled=CardState.page == 0,
+                            variant="soft",
+                            size="2",
+                        ),
+                        rx.text("Page ", CardState.page + 1, color="gray", size="2"),
+                        rx.button(
+                            "Next",
+                            on_click=CardState.next_page,
+                            disabled=~CardState.has_next_page,
+                            variant="soft",
+                            size="2",
+                        ),
+                        justify="center",
+                        align="center",
+                        width="100%",
                     ),
                     width="100%",
                 ),
@@ -1,25 +1,94 @@
+import time
+from datetime import date
 import reflex as rx
-from sqlmodel import select
-from typing import List
-from vocab_stack.models import Flashcard, LeitnerState, User, Topic
-from vocab_stack.database import get_session
 from vocab_stack.services.statistics_service import StatisticsService
 from vocab_stack.services.leitner_service import LeitnerService
 from vocab_stack.pages.auth import AuthState
 
 
+# A prefetch (nav link hover) is reused by on_mount within this window
+PREFETCH_WINDOW_SECONDS = 10
+
+# Topic cards shown per dashboard page
+TOPICS_PAGE_SIZE = 12
+
+# Topic rows and due totals per (user_id, day), as
+# (stored_at, card data version, topics, total_due). An entry is reused
+# within the TTL while the user's card data version is unchanged.
+DASHBOARD_CACHE_TTL_SECONDS = 30
+_dashboard_cache: dict[tuple[int, date], tuple[float, int, list[dict], int]] = {}
+
+
+def _load_topic_rows(user_id: int) -> tuple[list[dict], int]:
+    """
+    Build the dashboard topic rows, served from the cache when current.
+    
+    Args:
+        user_id: ID of the user
+        
+    Returns:
+        Tuple of (topic row dicts, total cards due today)
+    """
+    key = (user_id, date.today())
+    version = LeitnerService.card_data_version(user_id)
+    cached = _dashboard_cache.get(key)
+    if (
+        cached
+        and cached[1] == version
+        and time.monotonic() - cached[0] < DASHBOARD_CACHE_TTL_SECONDS
+    ):
+        return cached[2], cached[3]
+    
+    topics_list: list[dict] = []
+    total_due = 0
+    
+    # Topic columns and progress for every topic the user has cards in,
+    # in one joined query
+    for progress in LeitnerService.get_user_topic_progress(user_id):
+        due_today_val = int(progress.get("due_today", 0) or 0)
+        
+        topics_list.append({
+            "id": progress["id"],
+            "name": progress["name"],
+            "description": progress["description"] or "",
+            "total_cards": int(progress.get("total", 0) or 0),
+            "due_today": due_today_val,
+            "due_positive": due_today_val > 0,
+            "mastered": int(progress.get("mastered", 0) or 0),
+            "mastered_percentage": float(progress.get("mastered_percentage", 0.0) or 0.0),
+        })
+        total_due += due_today_val
+    
+    # Entries from earlier days can no longer be hit
+    for stale in [k for k in _dashboard_cache if k[1] != key[1]]:
+        del _dashboard_cache[stale]
+    _dashboard_cache[key] = (time.monotonic(), version, topics_list, total_due)
+    return topics_list, total_due
+
+
 class DashboardState(rx.State):
-    topics: list[dict] = []
+    topics: list[dict] = []  # Current page only
     total_due: int = 0
     loading: bool = False
     has_topics: bool = False
     
+    # Topic pagination
+    topics_page: int = 0
+    has_next_topics_page: bool = False
+    
     # Daily goal tracking
     daily_goal: int = 50
     reviews_today: int = 0
     goal_percentage: int = 0
     goal_reached: bool = False
 
+    # Backend-only: when prefetch last loaded the data, and the card data
+    # version it saw
+    _prefetched_at: float = 0.0
+    _prefetched_version: int = 0
+    # Backend-only: every topic row; topics holds the visible slice
+    _all_topics: list[dict] = []
+
     async def on_mount(self):
         """Load dashboard on page mount."""
         # Page is already protected by auth middleware
@@ -27,73 +96,76 @@ class DashboardState(rx.State):
         if not auth.current_user_id:
             return rx.redirect("/")
         
+        # Data loaded by a hover prefetch a moment ago is used once, unless
+        # cards or reviews (e.g. flushed answers) changed since
+        if (
+            time.monotonic() - self._prefetched_at < PREFETCH_WINDOW_SECONDS
+            and self._prefetched_version == LeitnerService.card_data_version(auth.current_user_id)
+        ):
+            self._prefetched_at = 0.0
+            return
+        
+        self.load_dashboard_data(auth.current_user_id)
+    
+    async def prefetch(self):
+        """Load the dashboard ahead of navigation (nav link hover)."""
+        if time.monotonic() - self._prefetched_at < PREFETCH_WINDOW_SECONDS:
+            return
+        
+        auth = await self.get_state(AuthState)
+        if not auth.current_user_id:
+            return
+        
         self.load_dashboard_data(auth.current_user_id)
+        self._prefetched_at = time.monotonic()
+        self._prefetched_version = LeitnerService.card_data_version(auth.current_user_id)
 
     def load_dashboard_data(self, user_id: int):
         """Load all dashboard data for the given user."""
         self.loading = True
-        topics_list: list[dict] = []
-        total_due = 0
+        topics_list, total_due = _load_topic_rows(user_id)
         
-        # Get user-specific data
-        with rx.session() as session:
-            # Get all topics where the user has flashcards
-            from sqlmodel import func
-            
-            # Get all topics for this user's flashcards
-            flashcards = session.exec(
-                select(Flashcard).where(Flashcard.user_id == user_id)
-            ).all()
-            
-            # Group by topic and get unique topics
-            topic_ids = set(fc.topic_id for fc in flashcards)
-            
-            for topic_id in topic_ids:
-                progress = LeitnerService.get_topic_progress(
-                    topic_id=topic_id, 
-                    user_id=user_id
-                )
-                due_today_val = int(progress.get("due_today", 0) or 0)
-                
-                # Get topic details
-                topic = session.exec(
-                    select(Topic).where(Topic.id == topic_id)
-                ).first()
-                
-                if topic:
-                    topics_list.append({
-                        "id": topic.id,
-                        "name": topic.name,
-                        "description": topic.description or "",
-                        "total_cards": int(progress.get("total", 0) or 0),
-                        "due_today": due_today_val,
-                        "due_positive": due_today_val > 0,
-                        "mastered": int(progress.get("mastered", 0) or 0),
-                        "mastered_percentage": float(progress.get("mastered_percentage", 0.0) or 0.0),
-                    })
-                    total_due += due_today_val
-                    
-        self.topics = topics_list
+        self._all_topics = topics_list
         self.total_due = total_due
         self.has_topics = len(topics_list) > 0
         
+        # Stay on the current page unless it no longer exists
+        last_page = max(0, (len(topics_list) - 1) // TOPICS_PAGE_SIZE)
+        self.topics_page = min(self.topics_page, last_page)
+        self._show_topics_page()
+        
         # Load daily goal progress
         self.load_daily_goal_progress(user_id)
         
         self.loading = False
     
+    def _show_topics_page(self):
+        """Set topics to the current page of the loaded topic rows."""
+        start = self.topics_page * TOPICS_PAGE_SIZE
+        page = self._all_topics[start:start + TOPICS_PAGE_SIZE]
+        # Assigning marks the var dirty and resends it; skip no-op refreshes
+        if page != self.topics:
+            self.topics = page
+        self.has_next_topics_page = len(self._all_topics) > start + TOPICS_PAGE_SIZE
+    
+    def next_topics_page(self):
+        """Show the next page of topics (no reload)."""
+        if self.has_next_topics_page:
+            self.topics_page += 1
+            self._show_topics_page()
+    
+    def prev_topics_page(self):
+        """Show the previous page of topics (no reload)."""
+        if self.topics_page > 0:
+            self.topics_page -= 1
+            self._show_topics_page()
+    
     def load_daily_goal_progress(self, user_id: int):
         """Load user's daily goal and today's review count."""
-        from vocab_stack.services.settings_service import SettingsService
-        from vocab_stack.services.statistics_service import StatisticsService
-        
-        # Get user preferences
-        settings = SettingsService.get_user_settings(user_id)
-        self.daily_goal = settings.get("daily_goal", 50)
-        
-        # Get today's review count
-        overview = StatisticsService.get_user_overview(user_id)
-        self.reviews_today = overview.get("reviews_today", 0)
+        # Goal and today's review count in one query
+        snapshot = StatisticsService.get_daily_goal_snapshot(user_id)
+        self.daily_goal = snapshot.get("daily_goal", 50)
+        self.reviews_today = snapshot.get("reviews_today", 0)
         
         # Calculate progress
         if self.daily_goal > 0:
@@ -208,11 +280,35 @@ def dashboard_page() -> rx.Component:
                 rx.heading("Your Topics", size="5", margin_top="1rem"),
                 rx.cond(
                     DashboardState.has_topics,
-                    rx.grid(
-                        rx.foreach(DashboardState.topics, topic_card),
-                        columns="3",
-                        spacing="4",
+                    rx.vstack(
+                        rx.grid(
+                            rx.foreach(DashboardState.topics, topic_card),
+                            columns="3",
+                            spacing="4",
+                            width="100%",
+                        ),
+                        rx.hstack(
+                            rx.button(
+                                "Previous",
+                                on_click=DashboardState.prev_topics_page,
+                                disabled=DashboardState.topics_page == 0,
+                                variant="soft",
+                                size="2",
+                            ),
+                            rx.text("Page ", DashboardState.topics_page + 1, color="gray", size="2"),
+                            rx.button(
+                                "Next",
+                                on_click=DashboardState.next_topics_page,
+                                disabled=~DashboardState.has_next_topics_page,
+                                variant="soft",
+                                size="2",
+                            ),
+                            justify="center",
+                            align="center",
+                            width="100%",
+                        ),
                         width="100%",
+                        spacing="4",
                     ),
                     rx.text("No topics yet. Create your first topic!", color="gray"),
                 ),
@@ -1,11 +1,23 @@
 """Flashcard review page and state."""
+import asyncio
 import reflex as rx
 from vocab_stack.services.leitner_service import LeitnerService
-from vocab_stack.models import Flashcard
+from vocab_stack.services.settings_service import SettingsService
+from vocab_stack.pages.auth import AuthState
+from vocab_stack.utils.text_comparison import check_answer as _check_answer
+
+
+# Answers are written in batches of this many cards (and at session end)
+REVIEW_FLUSH_EVERY = 5
 
 
 class ReviewState(rx.State):
-    cards_to_review: list[Flashcard] = []
+    # Backend-only: the session's cards; only current_card goes to the browser
+    _cards_to_review: list[dict] = []
+    current_card: dict = {}
+    next_card: dict = {}
+    show_example_block: bool = False
+    total_cards: int = 0
     current_index: int = 0
     show_answer: bool = False
     session_complete: bool = False
@@ -26,30 +38,25 @@ class ReviewState(rx.State):
     
     # Topic filtering
     selected_topic_id: int | None = None
+    
+    # Backend-only: answered (card_id, was_correct, time_spent) not yet saved
+    _pending_reviews: list[tuple[int, bool, int | None]] = []
 
-    @rx.var
-    def current_card(self) -> dict:
-        if 0 <= self.current_index < len(self.cards_to_review):
-            c = self.cards_to_review[self.current_index]
-            return {"id": c.id, "front": c.front, "back": c.back, "example": c.example or ""}
-        return {}
-
-    @rx.var
-    def progress_text(self) -> str:
-        if not self.cards_to_review:
-            return "0 / 0"
-        return f"{self.current_index + 1} / {len(self.cards_to_review)}"
-
-    @rx.var
-    def progress_percentage(self) -> int:
-        if not self.cards_to_review:
-            return 0
-        return int(((self.current_index + 1) / len(self.cards_to_review)) * 100)
+    def _show_current_card(self):
+        """Set current_card, next_card and show_example_block from current_index."""
+        if 0 <= self.current_index < self.total_cards:
+            self.current_card = self._cards_to_review[self.current_index]
+        else:
+            self.current_card = {}
+        if 0 <= self.current_index + 1 < self.total_cards:
+            self.next_card = self._cards_to_review[self.current_index + 1]
+        else:
+            self.next_card = {}
+        # Examples are enabled and the current card has one
+        self.show_example_block = self.show_examples and bool(self.current_card.get("example"))
 
     async def on_mount(self):
         """Load review session on page mount."""
-        from vocab_stack.pages.auth import AuthState
-        
         # Page is already protected by auth middleware
         auth = await self.get_state(AuthState)
         if not auth.current_user_id:
@@ -61,7 +68,6 @@ class ReviewState(rx.State):
     
     def load_user_preferences(self, user_id: int):
         """Load user preferences from settings."""
-        from vocab_stack.services.settings_service import SettingsService
         settings = SettingsService.get_user_settings(user_id)
         self.show_examples = settings.get("show_examples", True)
         self.cards_per_session = settings.get("cards_per_session", 20)
@@ -73,15 +79,17 @@ class ReviewState(rx.State):
         # Store the selected topic for later reloads
         self.selected_topic_id = topic_id
         # Get due cards with user's preferred order, limited by cards_per_session
-        all_cards = LeitnerService.get_due_cards(
+        self._cards_to_review = LeitnerService.get_due_card_rows(
             topic_id=topic_id,
             user_id=user_id,
-            review_order=self.review_order
+            review_order=self.review_order,
+            limit=self.cards_per_session,
         )
-        self.cards_to_review = all_cards[:self.cards_per_session]
+        self.total_cards = len(self._cards_to_review)
         self.current_index = 0
+        self._show_current_card()
         self.show_answer = False
-        self.session_complete = len(self.cards_to_review) == 0
+        self.session_complete = self.total_cards == 0
         self.correct_count = 0
         self.incorrect_count = 0
         self.loading = False
@@ -96,52 +104,80 @@ class ReviewState(rx.State):
     async def mark_correct(self):
         if not self.current_card:
             return
-        from vocab_stack.pages.auth import AuthState
-        auth = await self.get_state(AuthState)
-        if auth.current_user_id:
-            LeitnerService.process_review(self.current_card["id"], user_id=auth.current_user_id, was_correct=True)
+        self._pending_reviews.append((self.current_card["id"], True, None))
         self.correct_count += 1
         self._next_card()
+        if self._flush_due():
+            # Show the next card before waiting on the write
+            yield
+            await self.flush_reviews()
 
     async def mark_incorrect(self):
         if not self.current_card:
             return
-        from vocab_stack.pages.auth import AuthState
-        auth = await self.get_state(AuthState)
-        if auth.current_user_id:
-            LeitnerService.process_review(self.current_card["id"], user_id=auth.current_user_id, was_correct=False)
+        self._pending_reviews.append((self.current_card["id"], False, None))
         self.incorrect_count += 1
         self._next_card()
+        if self._flush_due():
+            yield
+            await self.flush_reviews()
+
+    def _flush_due(self) -> bool:
+        """Whether the queued answers should be written now."""
+        return bool(self._pending_reviews) and (
+            len(self._pending_reviews) >= REVIEW_FLUSH_EVERY or self.session_complete
+        )
+
+    async def flush_reviews(self):
+        """
+        Write queued answers with one batched process_reviews call.
+        
+        Runs every REVIEW_FLUSH_EVERY answers, when the session completes,
+        and on every protected page load (see app.py). Answers queued when
+        the tab is closed are never sent, so at most REVIEW_FLUSH_EVERY - 1
+        (4) answers can be lost.
+        """
+        if not self._pending_reviews:
+            return
+        pending = self._pending_reviews
+        self._pending_reviews = []
+        
+        auth = await self.get_state(AuthState)
+        if not auth.current_user_id:
+            return
+        try:
+            await asyncio.to_thread(LeitnerService.process_reviews, pending, auth.current_user_id)
+        except Exception:
+            # Put the batch back so the answers are retried on the next flush
+            self._pending_reviews = pending + self._pending_reviews
+            raise
 
     def _next_card(self):
         self.show_answer = False
         self.reset_input()  # Reset input for next card
         self.current_index += 1
-        if self.current_index >= len(self.cards_to_review):
+        self._show_current_card()
+        if self.current_index >= self.total_cards:
             self.session_complete = True
 
     def check_answer(self):
         """Check the user's typed answer against the correct answer."""
         if not self.current_card:
             return
-        from vocab_stack.utils.text_comparison import check_answer
-        
         # Use text comparison utility with normal strictness (case-insensitive)
-        self.is_correct = check_answer(self.user_input, self.current_card["back"], "normal")
+        self.is_correct = _check_answer(self.user_input, self.current_card["back"], "normal")
         self.answer_checked = True
 
-    async def submit_answer(self):
+    async def submit_answer(self, form_data: dict):
         """Submit the typed answer and process the review."""
         if not self.current_card:
             return
         
+        self.user_input = form_data.get("answer", "")
         self.check_answer()
         
-        # Record the review
-        from vocab_stack.pages.auth import AuthState
-        auth = await self.get_state(AuthState)
-        if auth.current_user_id:
-            LeitnerService.process_review(self.current_card["id"], user_id=auth.current_user_id, was_correct=self.is_correct)
+        # Queue the review; written in batches by flush_reviews
+        self._pending_reviews.append((self.current_card["id"], self.is_correct, None))
         
         if self.is_correct:
             self.correct_count += 1
@@ -149,11 +185,10 @@ class ReviewState(rx.State):
             self.incorrect_count += 1
             
         self._next_card()
+        if self._flush_due():
+            yield
+            await self.flush_reviews()
 
-    def set_user_input(self, user_input: str):
-        """Set the user input."""
-        self.user_input = user_input
-    
     def reset_input(self):
         """Reset the user input for the next question."""
         self.user_input = ""
@@ -178,7 +213,7 @@ def reveal_mode_display() -> rx.Component:
                 rx.heading(ReviewState.current_card["back"], size="6", text_align="center"),
                 # Only show example if preference is enabled AND card has an example
                 rx.cond(
-                    ReviewState.show_examples & (ReviewState.current_card["example"].to_string() != ""),
+                    ReviewState.show_example_block,
                     rx.box(
                         rx.text("Example:", size="2", color="gray", weight="bold"),
                         rx.text(ReviewState.current_card["example"], size="3", style={"fontStyle": "italic"}),
@@ -210,38 +245,37 @@ def type_mode_display() -> rx.Component:
             rx.text("Question", size="2", color="gray", weight="bold"),
             rx.heading(ReviewState.current_card["front"], size="7", text_align="center"),
             
-            # Input field for typing answer
-            rx.vstack(
-                rx.text("Type your answer:", size="2", color="gray", weight="bold", text_align="center"),
-                rx.input(
-                    value=ReviewState.user_input,
-                    on_change=ReviewState.set_user_input,
-                    on_key_down=lambda key: rx.cond(
-                        key == "Enter",
-                        ReviewState.submit_answer(),
-                        rx.noop()  # Do nothing if not Enter key
+            # Answer form: the typed text is sent once on submit (button or
+            # Enter) instead of a state update per keystroke
+            rx.form(
+                rx.vstack(
+                    rx.text("Type your answer:", size="2", color="gray", weight="bold", text_align="center"),
+                    rx.input(
+                        name="answer",
+                        placeholder="Enter your answer...",
+                        width="100%",
+                        size="3",
+                    ),
+                    # Submit button if answer not checked yet
+                    rx.cond(
+                        ReviewState.answer_checked == False,
+                        rx.button(
+                            "Check Answer",
+                            type="submit",
+                            size="3",
+                            variant="solid",
+                            color_scheme="blue",
+                            width="100%",
+                        ),
                     ),
-                    placeholder="Enter your answer...",
+                    spacing="2",
                     width="100%",
-                    size="3",
                 ),
-                spacing="2",
+                on_submit=ReviewState.submit_answer,
+                reset_on_submit=True,
                 width="100%",
             ),
             
-            # Submit button if answer not checked yet
-            rx.cond(
-                ReviewState.answer_checked == False,
-                rx.button(
-                    "Check Answer",
-                    on_click=ReviewState.submit_answer,
-                    size="3",
-                    variant="solid",
-                    color_scheme="blue",
-                    width="100%",
-                ),
-            ),
-            
             # Display result after checking answer
             rx.cond(
                 ReviewState.answer_checked,
@@ -301,7 +335,7 @@ def type_mode_display() -> rx.Component:
             
             # Only show example if preference is enabled AND card has an example
             rx.cond(
-                ReviewState.show_examples & (ReviewState.current_card["example"].to_string() != ""),
+                ReviewState.show_example_block,
                 rx.box(
                     rx.text("Example:", size="2", color="gray", weight="bold"),
                     rx.text(ReviewState.current_card["example"], size="3", style={"fontStyle": "italic"}),
@@ -328,7 +362,16 @@ def review_page() -> rx.Component:
             rx.heading("Review Session", size="7"),
             rx.vstack(
                 rx.hstack(
-                    rx.text(ReviewState.progress_text, weight="bold"),
+                    # Progress is derived in the browser from the index
+                    # and total; a card flip only sends current_index
+                    rx.text(
+                        rx.cond(
+                            ReviewState.total_cards > 0,
+                            (ReviewState.current_index + 1).to_string() + " / " + ReviewState.total_cards.to_string(),
+                            "0 / 0",
+                        ),
+                        weight="bold",
+                    ),
                     rx.spacer(),
                     rx.text(
                         "✅ " + ReviewState.correct_count.to_string() + " | ❌ " + ReviewState.incorrect_count.to_string(),
@@ -336,7 +379,15 @@ def review_page() -> rx.Component:
                     ),
                     width="100%",
                 ),
-                rx.progress(value=ReviewState.progress_percentage, width="100%", color_scheme="blue"),
+                rx.progress(
+                    value=rx.cond(
+                        ReviewState.total_cards > 0,
+                        (ReviewState.current_index + 1) * 100 // ReviewState.total_cards,
+                        0,
+                    ),
+                    width="100%",
+                    color_scheme="blue",
+                ),
                 width="100%",
                 spacing="2",
             ),
@@ -366,6 +417,14 @@ def review_page() -> rx.Component:
                     ),
                 ),
             ),
+            # Next card laid out off-screen so its text is ready on advance
+            rx.box(
+                rx.text(ReviewState.next_card["front"]),
+                rx.text(ReviewState.next_card["back"]),
+                rx.text(ReviewState.next_card["example"]),
+                display="none",
+                aria_hidden="true",
+            ),
             spacing="6",
             width="100%",
             max_width="800px",
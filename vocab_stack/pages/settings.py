@@ -1,7 +1,7 @@
 """Settings and preferences page."""
 import reflex as rx
 from vocab_stack.services.settings_service import SettingsService
-from vocab_stack.pages.auth import AuthState
+from vocab_stack.pages.auth import AuthState, apply_theme_script
 
 
 class SettingsState(rx.State):
@@ -100,9 +100,13 @@ class SettingsState(rx.State):
         await self.save_preferences()
     
     async def set_theme(self, value: str):
-        """Set theme and auto-save."""
+        """Set theme, apply it in the browser, and auto-save."""
         self.theme = value
         await self.save_preferences()
+        # Later page loads apply the theme from AuthState
+        auth = await self.get_state(AuthState)
+        auth.theme = value
+        return rx.call_script(apply_theme_script(value))
 
 
 def settings_section(title: str, content: rx.Component) -> rx.Component:
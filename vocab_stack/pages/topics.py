@@ -1,7 +1,9 @@
 """Topic management page."""
 import reflex as rx
 from vocab_stack.models import Topic, Flashcard, LeitnerState, ReviewHistory
-from sqlmodel import select
+from vocab_stack.services.leitner_service import LeitnerService
+from vocab_stack.pages.review import ReviewState
+from sqlmodel import select, func
 
 
 class TopicState(rx.State):
@@ -121,6 +123,9 @@ class TopicState(rx.State):
                 session.add(topic)
                 session.commit()
         
+        # Cached dashboards show topic names
+        LeitnerService.invalidate_user_progress()
+        
         self.editing_topic_id = -1
         self.error_message = ""
         self.load_topics()
@@ -131,12 +136,11 @@ class TopicState(rx.State):
         self.confirm_delete_topic_name = topic_name
         self.error_message = ""
         
-        # Count cards in this topic
+        # Count cards in this topic without loading them
         with rx.session() as session:
-            card_count = session.exec(
-                select(Flashcard).where(Flashcard.topic_id == topic_id)
-            ).all()
-            self.confirm_delete_card_count = len(card_count)
+            self.confirm_delete_card_count = session.exec(
+                select(func.count(Flashcard.id)).where(Flashcard.topic_id == topic_id)
+            ).one()
     
     def cancel_delete(self):
         """Cancel topic deletion."""
@@ -146,7 +150,6 @@ class TopicState(rx.State):
     
     async def add_to_review(self, topic_id: int):
         """Add this topic's cards to review and navigate to review page."""
-        from vocab_stack.pages.review import ReviewState
         review_state = await self.get_state(ReviewState)
         review_state.set_topic_for_review(topic_id)
         return rx.redirect("/review")
@@ -187,6 +190,9 @@ class TopicState(rx.State):
             
             session.commit()
         
+        # Cards of every user in this topic are gone
+        LeitnerService.invalidate_user_progress()
+        
         # Reset confirmation state and reload
         self.confirm_delete_topic_id = -1
         self.confirm_delete_topic_name = ""
@@ -1,12 +1,27 @@
 """Authentication service for user management."""
+import calendar
+import hashlib
+import hmac
+import os
 import secrets
 from datetime import datetime, timedelta
 from typing import Optional
 import bcrypt
 from vocab_stack.database import get_session
 from vocab_stack.models import User
+from vocab_stack.services import token_cache
 from sqlmodel import select
 
+# Key for signing session tokens. When set, tokens carry their expiry and an
+# HMAC so forged or expired cookies are rejected without a database lookup.
+# Leave unset to issue plain random tokens.
+SESSION_SECRET = os.getenv("SESSION_SECRET", "").encode("utf-8")
+
+
+def _sign(payload: str) -> str:
+    """HMAC-SHA256 of a token payload, hex encoded."""
+    return hmac.new(SESSION_SECRET, payload.encode("utf-8"), hashlib.sha256).hexdigest()
+
 
 class AuthService:
     """Service for authentication and session management."""
@@ -31,6 +46,10 @@ class AuthService:
         """Generate and store a session token for the user."""
         token = secrets.token_urlsafe(32)
         expires = datetime.utcnow() + timedelta(days=30)
+        if SESSION_SECRET:
+            # <random>.<expiry epoch>.<signature>; URL-safe tokens never contain "."
+            payload = f"{token}.{calendar.timegm(expires.utctimetuple())}"
+            token = f"{payload}.{_sign(payload)}"
         
         with get_session() as session:
             user = session.get(User, user_id)
@@ -40,9 +59,36 @@ class AuthService:
                 user.last_login = datetime.utcnow()
                 session.add(user)
                 session.commit()
+                
+                # The previous token is no longer valid; cache the new one so
+                # the first page load after login skips the database
+                token_cache.invalidate_user(user_id)
+                token_cache.put(token, user.id, user.username, user.is_admin, expires)
         
         return token
     
+    @staticmethod
+    def check_token_signature(token: str) -> bool:
+        """
+        Check a token's signature and expiry without touching the database.
+        
+        Returns False only for tokens that are certainly invalid: a signed
+        token with a bad signature or a past expiry, or any token that isn't
+        signed while SESSION_SECRET is set. Passing the check doesn't mean the
+        token is valid (it may have been revoked); use validate_token for that.
+        """
+        if not SESSION_SECRET:
+            return True
+        
+        parts = token.split(".")
+        if len(parts) != 3:
+            return False
+        
+        raw, expires_at, signature = parts
+        if not hmac.compare_digest(_sign(f"{raw}.{expires_at}"), signature):
+            return False
+        return expires_at.isdigit() and int(expires_at) > calendar.timegm(datetime.utcnow().utctimetuple())
+    
     @staticmethod
     def validate_token(token: str) -> Optional[User]:
         """Validate a session token and return the user if valid."""
@@ -69,6 +115,8 @@ class AuthService:
                 user.token_expires = None
                 session.add(user)
                 session.commit()
+        
+        token_cache.invalidate_user(user_id)
     
     @staticmethod
     def register_user(username: str, email: str, password: str) -> tuple[bool, str, Optional[User]]:
@@ -161,5 +209,6 @@ class AuthService:
                 user.is_admin = True
                 session.add(user)
                 session.commit()
+                token_cache.invalidate_user(user_id)
                 return True
         return False
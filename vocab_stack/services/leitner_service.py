@@ -1,13 +1,154 @@
 """Leitner spaced repetition algorithm implementation."""
+import random
 from datetime import datetime, date
 from typing import List, Optional
-from sqlmodel import select, and_
+from sqlalchemy import case, func, insert, lambda_stmt, update
+from sqlalchemy.orm import contains_eager
+from sqlmodel import select
 
-from vocab_stack.models import Flashcard, LeitnerState, ReviewHistory, User
-from vocab_stack.utils.date_helpers import calculate_next_review_date, is_due_for_review
+from vocab_stack.database import _ON_CONFLICT_INSERTS
+from vocab_stack.models import DailyReviewCount, Flashcard, LeitnerState, ReviewHistory, Topic, User
+from vocab_stack.utils.date_helpers import calculate_next_review_date
 import reflex as rx
 
 
+# Bound parameters per IN (...) query; stays under SQLite's variable limit
+IN_CLAUSE_CHUNK_SIZE = 500
+
+
+# Bumped on every card or review change; lets callers tell whether data they
+# cached from the card tables is still current. Per-user counters move only
+# for that user's changes (and for changes that hit every user).
+_card_data_version = 0
+_all_users_version = 0
+_user_data_versions: dict[int, int] = {}
+
+
+def _chunks(ids: List[int]):
+    """Split IDs into lists of at most IN_CLAUSE_CHUNK_SIZE."""
+    for start in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+        yield ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+
+
+def _leitner_state_stmt(flashcard_id: int):
+    """Cached SELECT of a card's Leitner state; flashcard_id is bound per call."""
+    return lambda_stmt(
+        lambda: select(LeitnerState).where(LeitnerState.flashcard_id == flashcard_id)
+    )
+
+
+def _leitner_box_stmt(flashcard_id: int):
+    """Cached SELECT of a card's current box number and its owner."""
+    return lambda_stmt(
+        lambda: select(LeitnerState.box_number, Flashcard.user_id)
+        .join(Flashcard)
+        .where(LeitnerState.flashcard_id == flashcard_id)
+    )
+
+
+def _count_reviews_stmt(dialect_name: str, user_id: int, day: date, reviews: int):
+    """
+    Upsert adding reviews to the user's DailyReviewCount row for day.
+    
+    Returns None for dialects without ON CONFLICT support.
+    """
+    upsert_insert = _ON_CONFLICT_INSERTS.get(dialect_name)
+    if upsert_insert is None:
+        return None
+    stmt = upsert_insert(DailyReviewCount).values(user_id=user_id, review_day=day, count=reviews)
+    return stmt.on_conflict_do_update(
+        index_elements=[DailyReviewCount.user_id, DailyReviewCount.review_day],
+        set_={"count": DailyReviewCount.count + stmt.excluded.count},
+    )
+
+
+def _count_reviews(session, user_id: int, day: date, reviews: int):
+    """Add reviews to the user's daily counter in the session's transaction."""
+    stmt = _count_reviews_stmt(session.get_bind().dialect.name, user_id, day, reviews)
+    if stmt is not None:
+        session.execute(stmt)
+        return
+    
+    # No upsert: bump an existing row, insert one if nothing matched
+    updated = session.execute(
+        update(DailyReviewCount)
+        .where(DailyReviewCount.user_id == user_id, DailyReviewCount.review_day == day)
+        .values(count=DailyReviewCount.count + reviews)
+    )
+    if updated.rowcount == 0:
+        session.execute(
+            insert(DailyReviewCount).values(user_id=user_id, review_day=day, count=reviews)
+        )
+
+
+def _statistics_from_row(leitner) -> dict:
+    """Build the card statistics dict from a LeitnerState row."""
+    total_reviews = leitner.correct_count + leitner.incorrect_count
+    accuracy = (leitner.correct_count / total_reviews * 100) if total_reviews > 0 else 0
+    
+    return {
+        "box_number": leitner.box_number,
+        "correct_count": leitner.correct_count,
+        "incorrect_count": leitner.incorrect_count,
+        "total_reviews": total_reviews,
+        "accuracy": round(accuracy, 2),
+        "next_review_date": leitner.next_review_date,
+        "last_reviewed": leitner.last_reviewed,
+    }
+
+
+def _progress_from_rows(rows) -> dict:
+    """Build the topic progress dict from (box_number, count, due) rows."""
+    total = sum(count for _, count, _ in rows)
+    if not total:
+        return {"total": 0, "by_box": {}}
+    
+    box_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
+    due_count = 0
+    
+    # Cards without a Leitner state are in the None group
+    for box_number, count, due in rows:
+        if box_number is not None:
+            box_counts[box_number] = count
+            due_count += due
+    
+    mastered_count = box_counts[5]
+    mastered_percentage = mastered_count / total * 100
+    
+    return {
+        "total": total,
+        "by_box": box_counts,
+        "due_today": due_count,
+        "mastered": mastered_count,
+        "mastered_percentage": round(mastered_percentage, 2),
+    }
+
+
+def _reservoir_sample(rows, k: int) -> list:
+    """
+    Pick k rows uniformly at random in one pass (Algorithm R).
+    
+    Args:
+        rows: Iterable of rows, e.g. a result being streamed from the cursor
+        k: Sample size
+        
+    Returns:
+        Up to k rows, in no particular order
+    """
+    if k <= 0:
+        return []
+    
+    sample = []
+    for seen, row in enumerate(rows):
+        if seen < k:
+            sample.append(row)
+        else:
+            slot = random.randint(0, seen)
+            if slot < k:
+                sample[slot] = row
+    return sample
+
+
 class LeitnerService:
     """Service for managing Leitner box algorithm."""
     
@@ -29,33 +170,36 @@ class LeitnerService:
             >>> cards = LeitnerService.get_due_cards(topic_id=1, user_id=1, review_order="oldest_first")
             >>> print(f"Found {len(cards)} cards to review")
         """
-        import random
+        today = date.today()
         
         with rx.session() as session:
-            # Build query
-            query = select(Flashcard).join(LeitnerState)
+            # Build query as a cached lambda statement: each variant is
+            # compiled once, closure values are bound as parameters.
+            # leitner_state is filled from the join, so reading it is free.
+            query = lambda_stmt(
+                lambda: select(Flashcard)
+                .join(LeitnerState)
+                .options(contains_eager(Flashcard.leitner_state))
+                .where(LeitnerState.next_review_date <= today)
+            )
             
             # Add filters
-            conditions = [LeitnerState.next_review_date <= date.today()]
-            
             if topic_id is not None:
                 # When reviewing by topic, show all cards in that topic (regardless of owner)
-                conditions.append(Flashcard.topic_id == topic_id)
+                query += lambda q: q.where(Flashcard.topic_id == topic_id)
             elif user_id is not None:
                 # When no topic specified, only show user's own cards
-                conditions.append(Flashcard.user_id == user_id)
-            
-            query = query.where(and_(*conditions))
+                query += lambda q: q.where(Flashcard.user_id == user_id)
             
             # Apply ordering
             if review_order == "oldest_first":
-                query = query.order_by(Flashcard.created_at.asc())
+                query += lambda q: q.order_by(Flashcard.created_at.asc())
             elif review_order == "newest_first":
-                query = query.order_by(Flashcard.created_at.desc())
+                query += lambda q: q.order_by(Flashcard.created_at.desc())
             # For random, we'll shuffle after fetching
             
             # Execute
-            cards = session.exec(query).all()
+            cards = session.scalars(query).all()
             
             # Shuffle if random order
             if review_order == "random":
@@ -65,6 +209,71 @@ class LeitnerService:
             
             return cards
     
+    @staticmethod
+    def get_due_card_rows(
+        topic_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        review_order: str = "random",
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Get the cards due today as plain dicts, for the review page.
+        
+        Same filters as get_due_cards, but only id, front, back and example
+        are selected and no ORM objects are built.
+        
+        Args:
+            topic_id: Filter by topic (optional); takes precedence over user_id
+            user_id: Filter by user (optional)
+            review_order: "random", "oldest_first" or "newest_first"
+            limit: Maximum number of cards to return (optional)
+            
+        Returns:
+            List of dicts with id, front, back and example ("" when unset)
+        """
+        today = date.today()
+        
+        with rx.session() as session:
+            query = lambda_stmt(
+                lambda: select(
+                    Flashcard.id,
+                    Flashcard.front,
+                    Flashcard.back,
+                    Flashcard.example,
+                )
+                .join(LeitnerState)
+                .where(LeitnerState.next_review_date <= today)
+            )
+            
+            if topic_id is not None:
+                query += lambda q: q.where(Flashcard.topic_id == topic_id)
+            elif user_id is not None:
+                query += lambda q: q.where(Flashcard.user_id == user_id)
+            
+            if review_order == "oldest_first":
+                query += lambda q: q.order_by(Flashcard.created_at.asc())
+            elif review_order == "newest_first":
+                query += lambda q: q.order_by(Flashcard.created_at.desc())
+            
+            ordered = review_order in ("oldest_first", "newest_first")
+            if limit is not None and ordered:
+                query += lambda q: q.limit(limit)
+            
+            if ordered or limit is None:
+                rows = session.execute(query).all()
+            else:
+                # A random pick has to see every due card; sample while
+                # streaming instead of holding them all
+                rows = _reservoir_sample(session.execute(query), limit)
+        
+        cards = [
+            {"id": card_id, "front": front, "back": back, "example": example or ""}
+            for card_id, front, back, example in rows
+        ]
+        if not ordered:
+            random.shuffle(cards)
+        return cards
+    
     @staticmethod
     def get_card_statistics(flashcard_id: int) -> dict:
         """
@@ -77,25 +286,57 @@ class LeitnerService:
             Dictionary with statistics (box, correct_count, accuracy, etc.)
         """
         with rx.session() as session:
-            leitner = session.exec(
-                select(LeitnerState).where(LeitnerState.flashcard_id == flashcard_id)
+            # Plain column row, no ORM instance
+            leitner = session.execute(
+                lambda_stmt(
+                    lambda: select(
+                        LeitnerState.box_number,
+                        LeitnerState.correct_count,
+                        LeitnerState.incorrect_count,
+                        LeitnerState.next_review_date,
+                        LeitnerState.last_reviewed,
+                    ).where(LeitnerState.flashcard_id == flashcard_id)
+                )
             ).first()
             
             if not leitner:
                 return {}
             
-            total_reviews = leitner.correct_count + leitner.incorrect_count
-            accuracy = (leitner.correct_count / total_reviews * 100) if total_reviews > 0 else 0
+            return _statistics_from_row(leitner)
+    
+    @staticmethod
+    def get_states_for(flashcard_ids: List[int]) -> dict[int, dict]:
+        """
+        Get statistics for many flashcards with batched IN queries.
+        
+        One query per IN_CLAUSE_CHUNK_SIZE IDs.
+        
+        Args:
+            flashcard_ids: IDs of the flashcards
             
-            return {
-                "box_number": leitner.box_number,
-                "correct_count": leitner.correct_count,
-                "incorrect_count": leitner.incorrect_count,
-                "total_reviews": total_reviews,
-                "accuracy": round(accuracy, 2),
-                "next_review_date": leitner.next_review_date,
-                "last_reviewed": leitner.last_reviewed,
-            }
+        Returns:
+            Dictionary mapping flashcard ID to the same statistics dict as
+            get_card_statistics. Cards without a Leitner state are omitted.
+        """
+        if not flashcard_ids:
+            return {}
+        
+        states = {}
+        with rx.session() as session:
+            for chunk in _chunks(flashcard_ids):
+                rows = session.execute(
+                    select(
+                        LeitnerState.flashcard_id,
+                        LeitnerState.box_number,
+                        LeitnerState.correct_count,
+                        LeitnerState.incorrect_count,
+                        LeitnerState.next_review_date,
+                        LeitnerState.last_reviewed,
+                    ).where(LeitnerState.flashcard_id.in_(chunk))
+                ).all()
+                states.update((row.flashcard_id, _statistics_from_row(row)) for row in rows)
+        
+        return states
     
     @staticmethod
     def process_review(
@@ -126,60 +367,170 @@ class LeitnerService:
             >>> print(f"Card moved to box {result['new_box']}")
         """
         with rx.session() as session:
-            # Get current Leitner state
-            leitner = session.exec(
-                select(LeitnerState).where(LeitnerState.flashcard_id == flashcard_id)
-            ).first()
+            # Get current box and owner (plain columns, no ORM object to track)
+            row = session.execute(_leitner_box_stmt(flashcard_id)).first()
             
-            if not leitner:
+            if row is None:
                 raise ValueError(f"No Leitner state found for flashcard {flashcard_id}")
+            old_box, owner_id = row
             
-            # Store old state
-            old_box = leitner.box_number
+            # Move to next box (max 5) if correct, back to box 1 if not
+            new_box = min(old_box + 1, 5) if was_correct else 1
+            now = datetime.utcnow()
+            next_review_date = calculate_next_review_date(new_box, date.today())
             
-            # Update box number based on correctness
-            if was_correct:
-                leitner.correct_count += 1
-                # Move to next box (max 5)
-                leitner.box_number = min(leitner.box_number + 1, 5)
-            else:
-                leitner.incorrect_count += 1
-                # Move back to box 1
-                leitner.box_number = 1
-            
-            # Update review dates
-            leitner.last_reviewed = datetime.utcnow()
-            leitner.next_review_date = calculate_next_review_date(
-                leitner.box_number,
-                date.today()
-            )
-            
-            # Save Leitner state
-            session.add(leitner)
+            # Update state in one statement; counters are incremented in SQL
+            correct_count, incorrect_count = session.execute(
+                update(LeitnerState)
+                .where(LeitnerState.flashcard_id == flashcard_id)
+                .values(
+                    box_number=new_box,
+                    next_review_date=next_review_date,
+                    last_reviewed=now,
+                    correct_count=LeitnerState.correct_count + int(was_correct),
+                    incorrect_count=LeitnerState.incorrect_count + int(not was_correct),
+                )
+                .returning(LeitnerState.correct_count, LeitnerState.incorrect_count)
+                .execution_options(synchronize_session=False)
+            ).one()
             
             # Create review history record
-            review = ReviewHistory(
-                flashcard_id=flashcard_id,
-                user_id=user_id,
-                was_correct=was_correct,
-                time_spent_seconds=time_spent_seconds,
-                review_date=datetime.utcnow()
+            session.execute(
+                insert(ReviewHistory).values(
+                    flashcard_id=flashcard_id,
+                    user_id=user_id,
+                    was_correct=was_correct,
+                    time_spent_seconds=time_spent_seconds,
+                    review_date=now,
+                )
             )
-            session.add(review)
+            # Today's counter, in the same transaction as the history row
+            _count_reviews(session, user_id, now.date(), 1)
             
             session.commit()
+            # Topic review covers other users' cards; the owner's caches change
+            LeitnerService.invalidate_user_progress(owner_id)
             
             # Return summary
             return {
                 "old_box": old_box,
-                "new_box": leitner.box_number,
-                "next_review_date": leitner.next_review_date,
-                "correct_count": leitner.correct_count,
-                "incorrect_count": leitner.incorrect_count,
+                "new_box": new_box,
+                "next_review_date": next_review_date,
+                "correct_count": correct_count,
+                "incorrect_count": incorrect_count,
                 "moved_up": was_correct and old_box < 5,
                 "moved_down": not was_correct,
             }
     
+    @staticmethod
+    def process_reviews(
+        reviews: List[tuple[int, bool, Optional[int]]],
+        user_id: int
+    ) -> List[dict]:
+        """
+        Process several reviews in a single transaction.
+        
+        Leitner states are fetched with one IN query, updated with one
+        executemany UPDATE, and review history is written with one
+        executemany INSERT.
+        
+        Args:
+            reviews: List of (flashcard_id, was_correct, time_spent_seconds)
+            user_id: ID of user who reviewed
+            
+        Returns:
+            List of summary dicts (same shape as process_review), in input
+            order. Reviews of cards without a Leitner state (e.g. deleted
+            while queued) are skipped and get no entry.
+            
+        Example:
+            >>> results = LeitnerService.process_reviews(
+            ...     [(1, True, 10), (2, False, 12)],
+            ...     user_id=1
+            ... )
+            >>> print([r["new_box"] for r in results])
+        """
+        if not reviews:
+            return []
+        
+        with rx.session() as session:
+            flashcard_ids = {flashcard_id for flashcard_id, _, _ in reviews}
+            states = {
+                row.flashcard_id: row._asdict()
+                for row in session.exec(
+                    select(
+                        LeitnerState.id,
+                        LeitnerState.flashcard_id,
+                        LeitnerState.box_number,
+                        LeitnerState.correct_count,
+                        LeitnerState.incorrect_count,
+                    ).where(LeitnerState.flashcard_id.in_(flashcard_ids))
+                ).all()
+            }
+            
+            # Skip cards deleted since they were queued instead of failing the batch
+            reviews = [review for review in reviews if review[0] in states]
+            if not reviews:
+                return []
+            flashcard_ids = states.keys()
+            
+            today = date.today()
+            now = datetime.utcnow()
+            results = []
+            history_rows = []
+            
+            # Apply reviews in order so repeated cards progress correctly
+            for flashcard_id, was_correct, time_spent_seconds in reviews:
+                state = states[flashcard_id]
+                old_box = state["box_number"]
+                
+                if was_correct:
+                    state["correct_count"] += 1
+                    state["box_number"] = min(old_box + 1, 5)
+                else:
+                    state["incorrect_count"] += 1
+                    state["box_number"] = 1
+                
+                state["last_reviewed"] = now
+                state["next_review_date"] = calculate_next_review_date(state["box_number"], today)
+                
+                history_rows.append({
+                    "flashcard_id": flashcard_id,
+                    "user_id": user_id,
+                    "was_correct": was_correct,
+                    "time_spent_seconds": time_spent_seconds,
+                    "review_date": now,
+                })
+                results.append({
+                    "old_box": old_box,
+                    "new_box": state["box_number"],
+                    "next_review_date": state["next_review_date"],
+                    "correct_count": state["correct_count"],
+                    "incorrect_count": state["incorrect_count"],
+                    "moved_up": was_correct and old_box < 5,
+                    "moved_down": not was_correct,
+                })
+            
+            # Bulk UPDATE by primary key, then bulk INSERT history
+            session.execute(
+                update(LeitnerState),
+                [
+                    {key: value for key, value in state.items() if key != "flashcard_id"}
+                    for state in states.values()
+                ],
+            )
+            owner_ids = session.scalars(
+                select(Flashcard.user_id).where(Flashcard.id.in_(flashcard_ids)).distinct()
+            ).all()
+            session.execute(insert(ReviewHistory), history_rows)
+            _count_reviews(session, user_id, now.date(), len(history_rows))
+            session.commit()
+            # Topic review covers other users' cards; the owners' caches change
+            for owner_id in owner_ids:
+                LeitnerService.invalidate_user_progress(owner_id)
+            
+            return results
+    
     @staticmethod
     def get_topic_progress(topic_id: int, user_id: int) -> dict:
         """
@@ -193,39 +544,113 @@ class LeitnerService:
             Dictionary with progress statistics
         """
         with rx.session() as session:
-            # Get all flashcards for topic/user
-            cards = session.exec(
-                select(Flashcard).where(
-                    and_(
+            # Count cards per box (and how many are due) in one aggregate
+            # query; cards without a Leitner state land in the None group
+            today = date.today()
+            rows = session.execute(
+                lambda_stmt(
+                    lambda: select(
+                        LeitnerState.box_number,
+                        func.count(Flashcard.id),
+                        func.sum(case((LeitnerState.next_review_date <= today, 1), else_=0)),
+                    )
+                    .select_from(Flashcard)
+                    .outerjoin(LeitnerState)
+                    .where(
                         Flashcard.topic_id == topic_id,
                         Flashcard.user_id == user_id
                     )
+                    .group_by(LeitnerState.box_number)
                 )
             ).all()
+        
+        return _progress_from_rows(rows)
+    
+    @staticmethod
+    def get_user_topic_progress(user_id: int) -> List[dict]:
+        """
+        Get every topic the user has cards in, with its progress.
+        
+        One grouped query over flashcard joined to topic and leitnerstate,
+        so topic columns and counts come back in a single round trip.
+        
+        Args:
+            user_id: ID of the user
             
-            if not cards:
-                return {"total": 0, "by_box": {}}
-            
-            # Count cards by box
-            box_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-            due_count = 0
-            
-            for card in cards:
-                if card.leitner_state:
-                    box_counts[card.leitner_state.box_number] += 1
-                    if is_due_for_review(card.leitner_state.next_review_date):
-                        due_count += 1
-            
-            mastered_count = box_counts[5]
-            mastered_percentage = (mastered_count / len(cards) * 100) if cards else 0
-            
-            return {
-                "total": len(cards),
-                "by_box": box_counts,
-                "due_today": due_count,
-                "mastered": mastered_count,
-                "mastered_percentage": round(mastered_percentage, 2),
+        Returns:
+            List of dicts ordered by topic ID, each with id, name and
+            description plus the get_topic_progress fields
+        """
+        with rx.session() as session:
+            today = date.today()
+            rows = session.execute(
+                select(
+                    Topic.id,
+                    Topic.name,
+                    Topic.description,
+                    LeitnerState.box_number,
+                    func.count(Flashcard.id),
+                    func.sum(case((LeitnerState.next_review_date <= today, 1), else_=0)),
+                )
+                .select_from(Flashcard)
+                .join(Topic, Flashcard.topic_id == Topic.id)
+                .outerjoin(LeitnerState)
+                .where(Flashcard.user_id == user_id)
+                .group_by(Topic.id, LeitnerState.box_number)
+                .order_by(Topic.id)
+            ).all()
+        
+        topics: dict[int, tuple] = {}
+        rows_by_topic: dict[int, list] = {}
+        for topic_id, name, description, box_number, count, due in rows:
+            topics[topic_id] = (name, description)
+            rows_by_topic.setdefault(topic_id, []).append((box_number, count, due))
+        
+        return [
+            {
+                "id": topic_id,
+                "name": name,
+                "description": description,
+                **_progress_from_rows(rows_by_topic[topic_id]),
             }
+            for topic_id, (name, description) in topics.items()
+        ]
+    
+    @staticmethod
+    def invalidate_user_progress(user_id: Optional[int] = None) -> None:
+        """
+        Mark cached card and progress data stale after cards or reviews change.
+        
+        Bumps the counters returned by card_data_version, which the card
+        list and dashboard caches compare against.
+        
+        Args:
+            user_id: ID of the user whose cards changed, or None for every
+                     user (e.g. when a whole topic is deleted)
+        """
+        global _card_data_version, _all_users_version
+        _card_data_version += 1
+        
+        if user_id is None:
+            _all_users_version += 1
+        else:
+            _user_data_versions[user_id] = _user_data_versions.get(user_id, 0) + 1
+    
+    @staticmethod
+    def card_data_version(user_id: Optional[int] = None) -> int:
+        """
+        Counter that changes when cards or reviews change.
+        
+        Args:
+            user_id: Only count changes that affect this user, or None to
+                     count every invalidate_user_progress call
+            
+        Returns:
+            A number that increases whenever cached data may be stale
+        """
+        if user_id is None:
+            return _card_data_version
+        return _all_users_version + _user_data_versions.get(user_id, 0)
     
     @staticmethod
     def reset_card(flashcard_id: int) -> None:
@@ -236,9 +661,7 @@ class LeitnerService:
             flashcard_id: ID of the flashcard to reset
         """
         with rx.session() as session:
-            leitner = session.exec(
-                select(LeitnerState).where(LeitnerState.flashcard_id == flashcard_id)
-            ).first()
+            leitner = session.scalars(_leitner_state_stmt(flashcard_id)).first()
             
             if leitner:
                 leitner.box_number = 1
@@ -246,3 +669,4 @@ class LeitnerService:
                 leitner.last_reviewed = None
                 session.add(leitner)
                 session.commit()
+                LeitnerService.invalidate_user_progress()
@@ -1,9 +1,9 @@
 """Statistics and analytics service."""
 from datetime import datetime, date, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
 from sqlmodel import select, func, and_
-from sqlalchemy import Integer
-from vocab_stack.models import ReviewHistory, Flashcard, LeitnerState, Topic
+from sqlalchemy import Integer, case
+from vocab_stack.models import DailyReviewCount, ReviewHistory, Flashcard, LeitnerState, Topic, User
 import reflex as rx
 
 
@@ -19,59 +19,37 @@ class StatisticsService:
                 select(func.count(Flashcard.id)).where(Flashcard.user_id == user_id)
             ).one()
             
-            # Total reviews
-            total_reviews = session.exec(
-                select(func.count(ReviewHistory.id)).where(ReviewHistory.user_id == user_id)
-            ).one()
-            
-            # Reviews today
+            # Total, correct and today's reviews in one aggregate query
             today = datetime.utcnow().date()
-            reviews_today = session.exec(
-                select(func.count(ReviewHistory.id)).where(
-                    and_(
-                        ReviewHistory.user_id == user_id,
-                        func.date(ReviewHistory.review_date) == today
-                    )
-                )
+            total_reviews, correct_reviews, reviews_today = session.exec(
+                select(
+                    func.count(ReviewHistory.id),
+                    func.coalesce(func.sum(func.cast(ReviewHistory.was_correct, Integer)), 0),
+                    func.coalesce(
+                        func.sum(case((func.date(ReviewHistory.review_date) == today, 1), else_=0)),
+                        0,
+                    ),
+                ).where(ReviewHistory.user_id == user_id)
             ).one()
             
-            # Cards by box
-            box_distribution = {}
-            for box in range(1, 6):
-                count = session.exec(
-                    select(func.count(LeitnerState.id))
-                    .join(Flashcard)
-                    .where(
-                        and_(
-                            Flashcard.user_id == user_id,
-                            LeitnerState.box_number == box
-                        )
-                    )
-                ).one()
-                box_distribution[box] = count
-            
-            # Cards due today
-            cards_due = session.exec(
-                select(func.count(LeitnerState.id))
-                .join(Flashcard)
-                .where(
-                    and_(
-                        Flashcard.user_id == user_id,
-                        LeitnerState.next_review_date <= date.today()
-                    )
+            # Cards by box and cards due today in one grouped query
+            box_distribution = {box: 0 for box in range(1, 6)}
+            cards_due = 0
+            box_rows = session.exec(
+                select(
+                    LeitnerState.box_number,
+                    func.count(LeitnerState.id),
+                    func.sum(case((LeitnerState.next_review_date <= date.today(), 1), else_=0)),
                 )
-            ).one()
+                .join(Flashcard)
+                .where(Flashcard.user_id == user_id)
+                .group_by(LeitnerState.box_number)
+            ).all()
+            for box, count, due in box_rows:
+                box_distribution[box] = count
+                cards_due += due or 0
             
             # Overall accuracy
-            correct_reviews = session.exec(
-                select(func.count(ReviewHistory.id)).where(
-                    and_(
-                        ReviewHistory.user_id == user_id,
-                        ReviewHistory.was_correct == True
-                    )
-                )
-            ).one()
-            
             accuracy = (correct_reviews / total_reviews * 100) if total_reviews > 0 else 0
             
             return {
@@ -84,6 +62,108 @@ class StatisticsService:
                 "mastered_cards": box_distribution.get(5, 0),
             }
     
+    @staticmethod
+    def get_daily_goal_snapshot(user_id: int) -> dict:
+        """
+        Get the user's daily goal and today's review count in one query.
+        
+        Args:
+            user_id: ID of the user
+            
+        Returns:
+            Dictionary with daily_goal and reviews_today, or an empty dict
+            if the user does not exist
+        """
+        # Counter row kept by LeitnerService when reviews are recorded;
+        # review dates are UTC, so is the counter's day
+        reviews_today = func.coalesce(
+            select(DailyReviewCount.count)
+            .where(
+                DailyReviewCount.user_id == user_id,
+                DailyReviewCount.review_day == datetime.utcnow().date(),
+            )
+            .scalar_subquery(),
+            0,
+        )
+        
+        with rx.session() as session:
+            row = session.exec(
+                select(User.daily_goal, reviews_today).where(User.id == user_id)
+            ).first()
+        
+        if row is None:
+            return {}
+        daily_goal, count = row
+        return {"daily_goal": daily_goal, "reviews_today": count}
+    
+    @staticmethod
+    def get_overview_for_users(user_ids: Optional[List[int]]) -> Dict[int, dict]:
+        """
+        Get review totals and streaks for many users at once.
+        
+        Runs two queries regardless of how many users are passed: one
+        grouped count of reviews and one ordered fetch of distinct review
+        dates used for the streaks.
+        
+        Args:
+            user_ids: IDs of the users, or None for every user with reviews
+            
+        Returns:
+            Dictionary mapping user ID to a dict with total_reviews,
+            reviews_today, current_streak and longest_streak. With
+            user_ids=None, users without reviews are left out.
+        """
+        if user_ids is not None and not user_ids:
+            return {}
+        
+        def empty_overview() -> dict:
+            return {
+                "total_reviews": 0,
+                "reviews_today": 0,
+                "current_streak": 0,
+                "longest_streak": 0,
+            }
+        
+        overview = {user_id: empty_overview() for user_id in user_ids or ()}
+        
+        with rx.session() as session:
+            today = datetime.utcnow().date()
+            review_day = func.date(ReviewHistory.review_date)
+            
+            counts_query = (
+                select(
+                    ReviewHistory.user_id,
+                    func.count(ReviewHistory.id),
+                    func.sum(case((review_day == today, 1), else_=0)),
+                )
+                .group_by(ReviewHistory.user_id)
+            )
+            # Distinct review days per user, newest first
+            days_query = (
+                select(ReviewHistory.user_id, review_day)
+                .distinct()
+                .order_by(ReviewHistory.user_id, review_day.desc())
+            )
+            if user_ids is not None:
+                counts_query = counts_query.where(ReviewHistory.user_id.in_(user_ids))
+                days_query = days_query.where(ReviewHistory.user_id.in_(user_ids))
+            
+            for user_id, total_reviews, reviews_today in session.exec(counts_query).all():
+                entry = overview.setdefault(user_id, empty_overview())
+                entry["total_reviews"] = total_reviews
+                entry["reviews_today"] = reviews_today
+            
+            review_days = session.exec(days_query).all()
+        
+        dates_by_user: Dict[int, list] = {}
+        for user_id, day in review_days:
+            dates_by_user.setdefault(user_id, []).append(day)
+        
+        for user_id, days in dates_by_user.items():
+            overview[user_id].update(_calculate_streaks(days))
+        
+        return overview
+    
     @staticmethod
     def get_review_history_chart(user_id: int, days: int = 7) -> dict:
         """Get review history for the last N days."""
@@ -142,7 +222,8 @@ class StatisticsService:
     def get_topic_statistics(user_id: int) -> List[dict]:
         """Get statistics for each topic."""
         with rx.session() as session:
-            topics = session.exec(select(Topic)).all()
+            # Only id and name are read; skip building Topic objects
+            topics = session.exec(select(Topic.id, Topic.name)).all()
             
             result = []
             for topic in topics:
@@ -172,27 +253,17 @@ class StatisticsService:
                     )
                 ).one()
                 
-                # Total reviews for topic
-                reviews = session.exec(
-                    select(func.count(ReviewHistory.id))
-                    .join(Flashcard)
-                    .where(
-                        and_(
-                            Flashcard.topic_id == topic.id,
-                            ReviewHistory.user_id == user_id
-                        )
+                # Total and correct reviews for topic in one query
+                reviews, correct = session.exec(
+                    select(
+                        func.count(ReviewHistory.id),
+                        func.coalesce(func.sum(func.cast(ReviewHistory.was_correct, Integer)), 0),
                     )
-                ).one()
-                
-                # Correct reviews
-                correct = session.exec(
-                    select(func.count(ReviewHistory.id))
                     .join(Flashcard)
                     .where(
                         and_(
                             Flashcard.topic_id == topic.id,
-                            ReviewHistory.user_id == user_id,
-                            ReviewHistory.was_correct == True
+                            ReviewHistory.user_id == user_id
                         )
                     )
                 ).one()
@@ -221,41 +292,55 @@ class StatisticsService:
                 .order_by(func.date(ReviewHistory.review_date).desc())
             ).all()
             
-            if not review_date_strings:
-                return {"current_streak": 0, "longest_streak": 0}
-            
-            # Convert strings to date objects
-            review_dates = []
-            for date_str in review_date_strings:
-                if isinstance(date_str, str):
-                    review_dates.append(datetime.strptime(date_str, "%Y-%m-%d").date())
-                else:
-                    review_dates.append(date_str)
-            
-            # Calculate current streak
-            current_streak = 0
-            check_date = date.today()
-            
-            for review_date in review_dates:
-                if review_date == check_date or review_date == check_date - timedelta(days=1):
-                    current_streak += 1
-                    check_date = review_date - timedelta(days=1)
-                else:
-                    break
-            
-            # Calculate longest streak
-            longest_streak = 1
+            return _calculate_streaks(review_date_strings)
+
+
+def _calculate_streaks(review_date_strings) -> dict:
+    """
+    Calculate current and longest streaks from distinct review dates.
+    
+    Args:
+        review_date_strings: Distinct review dates, newest first. SQLite's
+                             date() returns strings; date objects also work.
+        
+    Returns:
+        Dictionary with current_streak and longest_streak
+    """
+    if not review_date_strings:
+        return {"current_streak": 0, "longest_streak": 0}
+    
+    # Convert strings to date objects
+    review_dates = []
+    for date_str in review_date_strings:
+        if isinstance(date_str, str):
+            review_dates.append(datetime.strptime(date_str, "%Y-%m-%d").date())
+        else:
+            review_dates.append(date_str)
+    
+    # Calculate current streak
+    current_streak = 0
+    check_date = date.today()
+    
+    for review_date in review_dates:
+        if review_date == check_date or review_date == check_date - timedelta(days=1):
+            current_streak += 1
+            check_date = review_date - timedelta(days=1)
+        else:
+            break
+    
+    # Calculate longest streak
+    longest_streak = 1
+    temp_streak = 1
+    
+    for i in range(1, len(review_dates)):
+        days_diff = (review_dates[i - 1] - review_dates[i]).days
+        if days_diff == 1:
+            temp_streak += 1
+            longest_streak = max(longest_streak, temp_streak)
+        else:
             temp_streak = 1
-            
-            for i in range(1, len(review_dates)):
-                days_diff = (review_dates[i - 1] - review_dates[i]).days
-                if days_diff == 1:
-                    temp_streak += 1
-                    longest_streak = max(longest_streak, temp_streak)
-                else:
-                    temp_streak = 1
-            
-            return {
-                "current_streak": current_streak,
-                "longest_streak": longest_streak,
-            }
+    
+    return {
+        "current_streak": current_streak,
+        "longest_streak": longest_streak,
+    }
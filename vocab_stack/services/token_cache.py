@@ -0,0 +1,96 @@
+"""In-process cache of validated session tokens."""
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+# Entries live at most this long, and never past the token's own expiry
+TOKEN_CACHE_TTL_SECONDS = 300
+TOKEN_CACHE_MAX_ENTRIES = 10_000
+
+_lock = threading.Lock()
+_entries: Dict[bytes, "CachedUser"] = {}
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """The user fields AuthState needs, plus when the entry expires."""
+    id: int
+    username: str
+    is_admin: bool
+    expires_at: float  # time.monotonic() deadline
+
+
+def _key(token: str) -> bytes:
+    """Key entries by a digest so raw tokens are not kept in memory."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def get(token: str) -> Optional[CachedUser]:
+    """
+    Look up a token.
+    
+    Args:
+        token: Session token from the cookie
+    
+    Returns:
+        The cached user, or None if the token is not cached or has expired
+    """
+    key = _key(token)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del _entries[key]
+            return None
+        return entry
+
+
+def put(token: str, user_id: int, username: str, is_admin: bool, token_expires: Optional[datetime]):
+    """
+    Cache a token that was just validated against the database.
+    
+    Args:
+        token: Session token from the cookie
+        user_id: ID of the token's user
+        username: The user's username
+        is_admin: Whether the user is an admin
+        token_expires: The token's expiry (UTC), caps the entry's lifetime
+    """
+    ttl = TOKEN_CACHE_TTL_SECONDS
+    if token_expires is not None:
+        ttl = min(ttl, (token_expires - datetime.utcnow()).total_seconds())
+    if ttl <= 0:
+        return
+    
+    entry = CachedUser(user_id, username, is_admin, time.monotonic() + ttl)
+    with _lock:
+        if len(_entries) >= TOKEN_CACHE_MAX_ENTRIES:
+            _evict_expired()
+            if len(_entries) >= TOKEN_CACHE_MAX_ENTRIES:
+                # Still full: drop the oldest entry (dicts keep insertion order)
+                del _entries[next(iter(_entries))]
+        _entries[_key(token)] = entry
+
+
+def invalidate(token: str):
+    """Drop a single token, e.g. on logout."""
+    with _lock:
+        _entries.pop(_key(token), None)
+
+
+def invalidate_user(user_id: int):
+    """Drop every cached token of a user whose session or role changed."""
+    with _lock:
+        for key in [key for key, entry in _entries.items() if entry.id == user_id]:
+            del _entries[key]
+
+
+def _evict_expired():
+    """Remove expired entries. Caller holds the lock."""
+    now = time.monotonic()
+    for key in [key for key, entry in _entries.items() if entry.expires_at <= now]:
+        del _entries[key]
@@ -11,6 +11,9 @@ BOX_INTERVALS = {
     5: 30,  # Monthly
 }
 
+# Precomputed timedeltas so the review hot path does a single dict lookup
+_BOX_DELTAS = {box: timedelta(days=days) for box, days in BOX_INTERVALS.items()}
+
 
 def get_review_interval(box_number: int) -> int:
     """
@@ -25,10 +28,10 @@ def get_review_interval(box_number: int) -> int:
     Raises:
         ValueError: If box_number is not between 1-5
     """
-    if box_number not in BOX_INTERVALS:
-        raise ValueError(f"Box number must be between 1-5, got {box_number}")
-    
-    return BOX_INTERVALS[box_number]
+    try:
+        return BOX_INTERVALS[box_number]
+    except KeyError:
+        raise ValueError(f"Box number must be between 1-5, got {box_number}") from None
 
 
 def calculate_next_review_date(box_number: int, last_reviewed: date = None) -> date:
@@ -52,23 +55,25 @@ def calculate_next_review_date(box_number: int, last_reviewed: date = None) -> d
     if last_reviewed is None:
         last_reviewed = date.today()
     
-    interval_days = get_review_interval(box_number)
-    next_date = last_reviewed + timedelta(days=interval_days)
-    
-    return next_date
+    try:
+        return last_reviewed + _BOX_DELTAS[box_number]
+    except KeyError:
+        raise ValueError(f"Box number must be between 1-5, got {box_number}") from None
 
 
-def is_due_for_review(next_review_date: date) -> bool:
+def is_due_for_review(next_review_date: date, today: date = None) -> bool:
     """
     Check if a card is due for review today.
     
     Args:
         next_review_date: Scheduled review date
+        today: Reference date (defaults to today); pass it in when
+               checking many cards in a loop
         
     Returns:
         True if review is due (today or overdue), False otherwise
     """
-    return next_review_date <= date.today()
+    return next_review_date <= (today or date.today())
 
 
 def days_until_review(next_review_date: date) -> int: